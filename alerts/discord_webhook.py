@@ -1,5 +1,8 @@
+import asyncio
 import logging
 import requests
+import httpx
+import orjson
 from typing import Dict, List, Optional
 from datetime import datetime
 
@@ -10,40 +13,58 @@ from config.config import (
     STOP_LOSS_LEVELS
 )
 from analysis.news.market_events import MarketEventsMonitor
+from utils.helpers import chunk_embeds
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 class DiscordWebhook:
     """Handles sending notifications to Discord"""
     
-    def __init__(self):
+    __slots__ = ('webhook_url', 'market_events_monitor', 'http_client', '_owns_client')
+    
+    MAX_RATE_LIMIT_RETRIES = 3
+    RATE_LIMIT_BACKOFF = 0.5  # seconds, doubled per retry when Retry-After is missing
+    MAX_EMBEDS = 10  # Discord's per-message embed limit
+    MAX_EMBED_CHARS = 6000  # Discord's per-message limit on total embed text
+    
+    # Emoji mappings
+    option_type_emojis = {
+        'call': '🟢',  # Green circle for calls
+        'put': '🔴'    # Red circle for puts
+    }
+    
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.webhook_url = DISCORD_WEBHOOK_URL
         self.market_events_monitor = MarketEventsMonitor()
-        
-        # Emoji mappings
-        self.option_type_emojis = {
-            'call': '🟢',  # Green circle for calls
-            'put': '🔴'    # Red circle for puts
+        # Pooled HTTP/2 client for async sends. A client passed in is shared
+        # and closed by the caller; otherwise one is created on first send and
+        # closed by aclose()
+        self.http_client = http_client
+        self._owns_client = http_client is None
+    
+    def _build_payload(self, message: str, title: str = None, embeds: Optional[List[Dict]] = None) -> Dict:
+        """Format the message payload; any extra embeds follow the main one"""
+        return {
+            "embeds": [{
+                "title": title,
+                "description": message,
+                "color": 0x00ff00,  # Green color
+                "timestamp": datetime.now().isoformat()
+            }, *(embeds or ())]
         }
     
-    def send_notification(self, message: str, title: str = None):
-        """Send a notification to Discord"""
+    def send_notification(self, message: str, title: str = None, embeds: Optional[List[Dict]] = None):
+        """Send a notification to Discord (at most MAX_EMBEDS embeds in total)"""
         try:
-            # Format the message payload
-            payload = {
-                "embeds": [{
-                    "title": title,
-                    "description": message,
-                    "color": 0x00ff00,  # Green color
-                    "timestamp": datetime.now().isoformat()
-                }]
-            }
+            payload = self._build_payload(message, title, embeds)
             
             # Send the request
             response = requests.post(
                 self.webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"}
+                data=orjson.dumps(payload),
+                headers=_JSON_HEADERS
             )
             
             if response.status_code != 204:
@@ -52,6 +73,51 @@ class DiscordWebhook:
         except Exception as e:
             logger.error(f"Error sending Discord notification: {e}")
     
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=10),
+                timeout=10.0
+            )
+        return self.http_client
+    
+    async def aclose(self):
+        """Close the HTTP client if this webhook created it"""
+        if self._owns_client and self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+    
+    async def send_notification_async(self, message: str, title: str = None, embeds: Optional[List[Dict]] = None):
+        """Send a notification to Discord without blocking the event loop
+        
+        The main embed and any extra embeds go out in as few requests as fit
+        Discord's limits: at most MAX_EMBEDS embeds and MAX_EMBED_CHARS
+        characters of embed text each.
+        Rate-limited (429) responses are retried after the server's Retry-After
+        delay, or with exponential backoff if the header is missing.
+        """
+        try:
+            all_embeds = self._build_payload(message, title, embeds)["embeds"]
+            for chunk in chunk_embeds(all_embeds, self.MAX_EMBEDS, self.MAX_EMBED_CHARS):
+                await self._post_async(orjson.dumps({"embeds": chunk}))
+            
+        except Exception as e:
+            logger.error(f"Error sending Discord notification: {e}")
+    
+    async def _post_async(self, body: bytes):
+        """POST one encoded payload, retrying rate-limited responses"""
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            response = await self._get_client().post(self.webhook_url, content=body, headers=_JSON_HEADERS)
+            if response.status_code != 429 or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                break
+            delay = float(response.headers.get("Retry-After", self.RATE_LIMIT_BACKOFF * 2 ** attempt))
+            logger.warning(f"Discord rate limited, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+        
+        if response.status_code != 204:
+            logger.error(f"Failed to send Discord notification: {response.text}")
+    
     def send_market_events(self):
         """Send market events notifications"""
         try:
@@ -80,7 +146,7 @@ class DiscordWebhook:
         except Exception as e:
             logger.error(f"Error sending market events: {e}")
     
-    def send_options_signal(self, symbol: str, current_price: float, option_type: str, 
+    async def send_options_signal(self, symbol: str, current_price: float, option_type: str, 
                           expiration_date: str, premium: float, 
                           take_profit_levels: List[float] = None,
                           stop_loss_levels: List[float] = None,
@@ -130,8 +196,7 @@ class DiscordWebhook:
             if ai_analysis:
                 try:
                     # Parse the AI analysis JSON
-                    import json
-                    analysis_data = json.loads(ai_analysis)
+                    analysis_data = orjson.loads(ai_analysis)
                     
                     # Add spacing between sections
                     message += "\n\n**📊 Technical Analysis:**\n"
@@ -167,12 +232,12 @@ class DiscordWebhook:
                         for level, price in analysis_data['key_levels'].items():
                             message += f"• {level.title()}: ${price}\n"
                             
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     # If AI analysis is not valid JSON, add it as plain text
                     message += f"\n\n**AI Analysis:**\n{ai_analysis}"
             
             # Send the notification
-            self.send_notification(
+            await self.send_notification_async(
                 message=message,
                 title=f"Options Signal: {symbol} {option_emoji}"
             )
@@ -19,7 +19,7 @@ class OpenAIExplainer:
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
             
-        openai.api_key = self.api_key
+        self.client = openai.OpenAI(api_key=self.api_key)
         logger.info("OpenAI Explainer initialized")
         
     def explain_signal(self, symbol: str, price: float, 
@@ -42,7 +42,7 @@ class OpenAIExplainer:
             prompt = self._create_prompt(symbol, price, technical_analysis, sentiment_analysis)
             
             # Generate explanation using OpenAI
-            response = openai.ChatCompletion.create(
+            response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a professional trading analyst explaining trading signals."},
@@ -1,5 +1,6 @@
 import logging
 import requests
+import orjson
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import pytz
@@ -37,7 +38,7 @@ class MarketEventsMonitor:
             response = requests.get(url, params=params)
             response.raise_for_status()
             
-            articles = response.json().get('articles', [])
+            articles = orjson.loads(response.content).get('articles', [])
             
             # Filter and format earnings announcements
             earnings = []
@@ -77,7 +78,7 @@ class MarketEventsMonitor:
             response = requests.get(url, params=params)
             response.raise_for_status()
             
-            articles = response.json().get('articles', [])
+            articles = orjson.loads(response.content).get('articles', [])
             
             # Filter and format Fed speeches
             speeches = []
@@ -9,6 +9,22 @@ from analysis.sentiment.news_fetcher import NewsFetcher
 
 logger = logging.getLogger(__name__)
 
+# Word lists for the simplified FinBERTAnalyzer scorer
+POSITIVE_WORDS = ("bullish", "up", "rise", "growth", "profit", "positive", "beat", "exceed",
+                  "strong", "surge", "gain", "opportunity", "optimistic", "momentum")
+NEGATIVE_WORDS = ("bearish", "down", "fall", "decline", "loss", "negative", "miss", "below",
+                  "weak", "drop", "decrease", "risk", "pessimistic", "downturn")
+
+# (keyword, lowercased keyword) pairs for keyword match counting
+_KEYWORDS_LOWER = tuple((keyword, keyword.lower()) for keyword in SENTIMENT_KEYWORDS)
+
+def _sentiment_label(score: float) -> str:
+    if score > 0.2:
+        return "positive"
+    if score < -0.2:
+        return "negative"
+    return "neutral"
+
 class FinbertAnalyzer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -81,16 +97,11 @@ class FinBERTAnalyzer:
     
     def _analyze_text(self, text):
         """Simple keyword-based sentiment analysis"""
-        positive_words = ["bullish", "up", "rise", "growth", "profit", "positive", "beat", "exceed", 
-                         "strong", "surge", "gain", "opportunity", "optimistic", "momentum"]
-        negative_words = ["bearish", "down", "fall", "decline", "loss", "negative", "miss", "below", 
-                         "weak", "drop", "decrease", "risk", "pessimistic", "downturn"]
-        
         text_lower = text.lower()
         
         # Count occurrences of positive and negative words
-        pos_count = sum(1 for word in positive_words if word in text_lower)
-        neg_count = sum(1 for word in negative_words if word in text_lower)
+        pos_count = sum(1 for word in POSITIVE_WORDS if word in text_lower)
+        neg_count = sum(1 for word in NEGATIVE_WORDS if word in text_lower)
         
         total = pos_count + neg_count
         if total == 0:
@@ -98,12 +109,7 @@ class FinBERTAnalyzer:
             label = "neutral"
         else:
             score = (pos_count - neg_count) / (pos_count + neg_count)
-            if score > 0.2:
-                label = "positive"
-            elif score < -0.2:
-                label = "negative"
-            else:
-                label = "neutral"
+            label = _sentiment_label(score)
                 
         return {
             "score": score,  # Range: -1 to 1
@@ -115,6 +121,41 @@ class FinBERTAnalyzer:
             }
         }
     
+    def batch_score(self, texts: List[str]) -> np.ndarray:
+        """Score a batch of texts in one pass; returns scores in [-1, 1]"""
+        return self._score_lowered([text.lower() for text in texts])
+    
+    @staticmethod
+    def _score_lowered(texts: List[str]) -> np.ndarray:
+        scores = np.zeros(len(texts))
+        for i, text in enumerate(texts):
+            pos_count = sum(word in text for word in POSITIVE_WORDS)
+            neg_count = sum(word in text for word in NEGATIVE_WORDS)
+            total = pos_count + neg_count
+            if total:
+                scores[i] = (pos_count - neg_count) / total
+        return scores
+    
+    def _summarize_articles(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Score and count keywords for all articles in a single pass"""
+        # Build and lowercase each article's text once for both scoring and keyword matching
+        texts = [f"{article['title']} {article['description'] or ''}".lower() for article in articles]
+        keyword_matches = {
+            keyword: sum(keyword_lower in text for text in texts)
+            for keyword, keyword_lower in _KEYWORDS_LOWER
+        }
+        
+        # Weighted average with more recent news having higher weight
+        scores = self._score_lowered(texts)
+        overall_score = float(np.average(scores, weights=np.linspace(1, 0.5, len(scores))))
+        
+        return {
+            "overall_score": overall_score,
+            "sentiment_label": _sentiment_label(overall_score),
+            "article_count": len(articles),
+            "keyword_matches": keyword_matches
+        }
+    
     def get_ticker_sentiment(self, ticker):
         """Get sentiment analysis for a specific ticker"""
         try:
@@ -131,46 +172,7 @@ class FinBERTAnalyzer:
                     "keyword_matches": {keyword: 0 for keyword in SENTIMENT_KEYWORDS}
                 }
             
-            # Analyze each article
-            sentiment_scores = []
-            keyword_matches = {keyword: 0 for keyword in SENTIMENT_KEYWORDS}
-            
-            for article in news_articles:
-                # Check for keywords
-                article_text = f"{article['title']} {article['description'] or ''}"
-                for keyword in SENTIMENT_KEYWORDS:
-                    if keyword.lower() in article_text.lower():
-                        keyword_matches[keyword] += 1
-                
-                # Get sentiment score
-                sentiment = self._analyze_text(article_text)
-                sentiment_scores.append(sentiment["score"])
-            
-            # Aggregate sentiment scores
-            if sentiment_scores:
-                # Weighted average with more recent news having higher weight
-                weights = np.linspace(1, 0.5, len(sentiment_scores))
-                weighted_scores = np.array(sentiment_scores) * weights
-                overall_score = np.sum(weighted_scores) / np.sum(weights)
-                
-                # Determine overall sentiment label
-                if overall_score > 0.2:
-                    sentiment_label = "positive"
-                elif overall_score < -0.2:
-                    sentiment_label = "negative"
-                else:
-                    sentiment_label = "neutral"
-            else:
-                overall_score = 0
-                sentiment_label = "neutral"
-            
-            return {
-                "ticker": ticker,
-                "overall_score": float(overall_score),
-                "sentiment_label": sentiment_label,
-                "article_count": len(news_articles),
-                "keyword_matches": keyword_matches
-            }
+            return {"ticker": ticker, **self._summarize_articles(news_articles)}
             
         except Exception as e:
             logger.error(f"Error getting ticker sentiment for {ticker}: {e}")
@@ -197,45 +199,7 @@ class FinBERTAnalyzer:
                     "keyword_matches": {keyword: 0 for keyword in SENTIMENT_KEYWORDS}
                 }
             
-            # Analyze each article
-            sentiment_scores = []
-            keyword_matches = {keyword: 0 for keyword in SENTIMENT_KEYWORDS}
-            
-            for article in market_news:
-                # Check for keywords
-                article_text = f"{article['title']} {article['description'] or ''}"
-                for keyword in SENTIMENT_KEYWORDS:
-                    if keyword.lower() in article_text.lower():
-                        keyword_matches[keyword] += 1
-                
-                # Get sentiment score
-                sentiment = self._analyze_text(article_text)
-                sentiment_scores.append(sentiment["score"])
-            
-            # Aggregate sentiment scores
-            if sentiment_scores:
-                # Weighted average with more recent news having higher weight
-                weights = np.linspace(1, 0.5, len(sentiment_scores))
-                weighted_scores = np.array(sentiment_scores) * weights
-                overall_score = np.sum(weighted_scores) / np.sum(weights)
-                
-                # Determine overall sentiment label
-                if overall_score > 0.2:
-                    sentiment_label = "positive"
-                elif overall_score < -0.2:
-                    sentiment_label = "negative"
-                else:
-                    sentiment_label = "neutral"
-            else:
-                overall_score = 0
-                sentiment_label = "neutral"
-            
-            return {
-                "overall_score": float(overall_score),
-                "sentiment_label": sentiment_label,
-                "article_count": len(market_news),
-                "keyword_matches": keyword_matches
-            }
+            return self._summarize_articles(market_news)
             
         except Exception as e:
             logger.error(f"Error getting market sentiment: {e}")
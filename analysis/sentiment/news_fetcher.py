@@ -2,6 +2,9 @@ import logging
 import time
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 
 from config.config import NEWS_API_KEY, SENTIMENT_KEYWORDS
 
@@ -11,10 +14,36 @@ class NewsFetcher:
     """Fetches news from various sources for sentiment analysis"""
     
     NEWSAPI_URL = "https://newsapi.org/v2/everything"
+    REQUEST_TIMEOUT = 10.0
+    BREAKER_THRESHOLD = 5      # consecutive failures before the endpoint is skipped
+    BREAKER_COOLDOWN = 60.0    # seconds to skip a tripped endpoint
+    MAX_BACKOFF = 8.0          # seconds; cap on any single retry delay
+    BACKOFF_JITTER = 0.5       # seconds of random delay added to each retry
     
     def __init__(self, api_key=NEWS_API_KEY):
         self.api_key = api_key
+        # Keep-alive session with a pooled adapter so calls reuse one TLS
+        # connection; urllib3 handles retries with capped exponential backoff,
+        # jittered so concurrent retries don't fire in lockstep
         self.session = requests.Session()
+        self.session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        })
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            backoff_max=self.MAX_BACKOFF,
+            backoff_jitter=self.BACKOFF_JITTER,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # endpoint -> (consecutive failures, monotonic time the breaker resets)
+        self._breaker = {}
     
     def _make_request(self, params):
         """Make a request to NewsAPI with retry logic"""
@@ -22,19 +51,25 @@ class NewsFetcher:
             logger.error("NEWS_API_KEY not configured")
             return {'articles': []}
             
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                params['apiKey'] = self.api_key
-                response = self.session.get(self.NEWSAPI_URL, params=params)
-                response.raise_for_status()
-                return response.json()
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"News API request failed (attempt {attempt+1}/{max_retries}): {e}")
-                if attempt == max_retries - 1:
-                    logger.error("All retry attempts failed for News API")
-                    return {'articles': []}
-                time.sleep(2 ** attempt)  # Exponential backoff
+        endpoint = self.NEWSAPI_URL
+        failures, reset_at = self._breaker.get(endpoint, (0, 0.0))
+        if failures >= self.BREAKER_THRESHOLD and time.monotonic() < reset_at:
+            logger.warning("News API circuit open, skipping request")
+            return {'articles': []}
+            
+        try:
+            params['apiKey'] = self.api_key
+            response = self.session.get(endpoint, params=params, timeout=self.REQUEST_TIMEOUT)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            failures += 1
+            self._breaker[endpoint] = (failures, time.monotonic() + self.BREAKER_COOLDOWN)
+            logger.error(f"News API request failed after retries: {e}")
+            return {'articles': []}
+        
+        self._breaker.pop(endpoint, None)
+        return data
     
     def get_news_for_ticker(self, ticker, days=2):
         """Get recent news articles for a specific ticker"""
@@ -1,23 +1,54 @@
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Union
 import os
 import pytz
+from datetime import date
+from functools import lru_cache
 
-from alpaca.data import StockHistoricalDataClient
-from alpaca.data.requests import StockBarsRequest, StockQuotesRequest
+from alpaca.data import StockHistoricalDataClient, OptionHistoricalDataClient
+from alpaca.data.requests import StockBarsRequest, StockQuotesRequest, OptionChainRequest
 from alpaca.data.timeframe import TimeFrame
 from alpaca.data.live import StockDataStream
 from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import GetAssetsRequest, MarketOrderRequest
 from alpaca.trading.enums import AssetClass, OrderSide, TimeInForce
 
+from utils.helpers import TTLCache
 from config.config import ALPACA_API_KEY, ALPACA_API_SECRET, TRADING_SYMBOLS, DTE_RANGE, DELTA_RANGE, OPTION_TYPES
 
 logger = logging.getLogger(__name__)
 
+# Quote lookups are network-bound, so overlap them on a small thread pool
+MAX_QUOTE_WORKERS = 16
+
+# Strike offsets for the simulated chain: 1% intervals, 5 either side of spot
+_STRIKE_OFFSETS = np.arange(-5, 6) * 0.01
+
+@lru_cache(maxsize=8)
+def _dte_window(dte_min: int, dte_max: int, today: date) -> tuple:
+    """(min_date, max_date) strings for a DTE range; keyed on today's date so it refreshes daily"""
+    return (
+        (today + timedelta(days=dte_min)).strftime('%Y-%m-%d'),
+        (today + timedelta(days=dte_max)).strftime('%Y-%m-%d')
+    )
+
+def _price_strikes(current_price: float, time_to_expiry: float,
+                   strikes: np.ndarray, is_call: bool) -> np.ndarray:
+    """Simulated premiums for a vector of strikes (see get_options_chain)"""
+    moneyness = (current_price - strikes) / current_price
+    # Base time value (decays with time to expiry)
+    time_value = 0.002 * (1 - time_to_expiry)
+    # Intrinsic value (if any), scaled down
+    intrinsic_value = np.maximum(0.0, moneyness if is_call else -moneyness) * 0.5
+    # Volatility component (higher for strikes closer to current price)
+    volatility = np.maximum(0.0005, 0.002 * (1 - np.abs(moneyness)))
+    return current_price * (time_value + intrinsic_value + volatility) * 0.1
+
 class AlpacaConnector:
     """Connector for Alpaca API to fetch real-time and historical data"""
     
@@ -29,11 +60,13 @@ class AlpacaConnector:
         try:
             self.stock_hist_client = StockHistoricalDataClient(api_key, api_secret)
             self.trading_client = TradingClient(api_key, api_secret, paper=True)  # Use paper trading
+            self.option_hist_client = OptionHistoricalDataClient(api_key, api_secret)
             logger.info("Connected to Alpaca APIs")
         except Exception as e:
             logger.error(f"Error connecting to Alpaca APIs: {e}")
             self.stock_hist_client = None
             self.trading_client = None
+            self.option_hist_client = None
         
         # Initialize real-time data stream
         try:
@@ -42,6 +75,11 @@ class AlpacaConnector:
         except Exception as e:
             logger.error(f"Error connecting to Alpaca Real-Time Data Stream: {e}")
             self.stream = None
+        
+        # Short-lived caches so repeat lookups within a scan or an event
+        # burst hit memory instead of the network
+        self._contracts_cache = TTLCache(maxsize=256, ttl=60)
+        self._real_time_cache = TTLCache(maxsize=32, ttl=2)
 
     def is_market_open(self) -> bool:
         """
@@ -98,8 +136,10 @@ class AlpacaConnector:
             
             bars_response = self.stock_hist_client.get_stock_bars(bars_request)
             if symbol in bars_response:
-                latest_bar = bars_response[symbol].df.iloc[-1]
-                return float(latest_bar['close'])
+                # Read the scalar straight from the column array rather than
+                # materializing the whole last row as a Series
+                df = bars_response[symbol].df
+                return float(df['close'].values[-1])
             
             return None
             
@@ -121,43 +161,20 @@ class AlpacaConnector:
             if not current_price:
                 return []
             
-            # Create simulated options chain with strikes around current price
-            strikes = [
-                current_price * (1 + i * 0.01)  # Strikes at 1% intervals
-                for i in range(-5, 6)  # 5 strikes above and below current price
-            ]
-            
-            options_chain = []
-            for strike in strikes:
-                # Simulate option premium based on strike and current price
-                # This is a more realistic model for testing
-                distance_from_strike = abs(current_price - strike) / current_price  # As percentage
-                time_to_expiry = (exp_date - datetime.now()).days / 365.0  # Years to expiry
-                
-                # Base time value (decays with time to expiry)
-                time_value = 0.002 * (1 - time_to_expiry)  # 0.2% base, decaying with time
-                
-                # Intrinsic value (if any)
-                intrinsic_value = max(0, 
-                    (current_price - strike) / current_price if option_type == 'call' 
-                    else (strike - current_price) / current_price
-                ) * 0.5  # Scale down intrinsic value
-                
-                # Volatility component (higher for strikes closer to current price)
-                volatility = max(0.0005, 0.002 * (1 - distance_from_strike))  # 0.05% to 0.2%
-                
-                # Calculate premium as percentage of stock price
-                premium_pct = time_value + intrinsic_value + volatility
-                premium = current_price * premium_pct * 0.1  # Scale down final premium
-                
-                # Only include options with premiums between $0.01 and $2.50
-                if 0.01 <= premium <= 2.50:
-                    options_chain.append({
-                        'strike': float(strike),
-                        'last_price': float(premium),
-                        'volume': 1000,  # Simulated volume
-                        'open_interest': 500  # Simulated open interest
-                    })
+            # Create simulated options chain with strikes around current price,
+            # priced in one vectorized pass
+            strikes = current_price * (1 + _STRIKE_OFFSETS)
+            time_to_expiry = (exp_date - datetime.now()).days / 365.0  # Years to expiry
+            premiums = _price_strikes(current_price, time_to_expiry, strikes, option_type == 'call')
+            
+            # Only include options with premiums between $0.01 and $2.50
+            mask = (premiums >= 0.01) & (premiums <= 2.50)
+            options_chain = [{
+                'strike': strike,
+                'last_price': premium,
+                'volume': 1000,  # Simulated volume
+                'open_interest': 500  # Simulated open interest
+            } for strike, premium in zip(strikes[mask].tolist(), premiums[mask].tolist())]
             
             return options_chain
             
@@ -189,8 +206,9 @@ class AlpacaConnector:
             # Get bars
             bars = self.stock_hist_client.get_stock_bars(request)
             
-            # Convert to DataFrame
-            df = pd.DataFrame(bars.df)
+            # alpaca-py already builds a typed DataFrame; wrapping it again
+            # in pd.DataFrame() only adds a copy
+            df = bars.df
             if not df.empty:
                 df.reset_index(inplace=True)
                 df.rename(columns={'timestamp': 'date'}, inplace=True)
@@ -211,14 +229,7 @@ class AlpacaConnector:
             quote_response = self.stock_hist_client.get_stock_latest_quote(quote_request)
             
             if symbol in quote_response:
-                quote = quote_response[symbol]
-                return {
-                    'ask_price': float(quote.ask_price),
-                    'ask_size': int(quote.ask_size),
-                    'bid_price': float(quote.bid_price),
-                    'bid_size': int(quote.bid_size),
-                    'timestamp': quote.timestamp
-                }
+                return self._quote_to_dict(quote_response[symbol])
             
             # Fallback to getting latest bar if quote is not available
             bars_request = StockBarsRequest(
@@ -230,13 +241,15 @@ class AlpacaConnector:
             
             bars_response = self.stock_hist_client.get_stock_bars(bars_request)
             if symbol in bars_response:
-                latest_bar = bars_response[symbol].df.iloc[-1]
+                df = bars_response[symbol].df
+                close = float(df['close'].values[-1])
+                volume = int(df['volume'].values[-1])
                 return {
-                    'ask_price': float(latest_bar['close']),
-                    'ask_size': int(latest_bar['volume']),
-                    'bid_price': float(latest_bar['close']),
-                    'bid_size': int(latest_bar['volume']),
-                    'timestamp': latest_bar.name
+                    'ask_price': close,
+                    'ask_size': volume,
+                    'bid_price': close,
+                    'bid_size': volume,
+                    'timestamp': df.index[-1]
                 }
             
             return None
@@ -245,6 +258,40 @@ class AlpacaConnector:
             logger.error(f"Error getting latest quote for {symbol}: {e}")
             return None
     
+    def get_latest_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get the latest quotes for several symbols in one request
+        
+        Symbols missing from the batch response fall back to get_latest_quote.
+        """
+        try:
+            quote_response = self.stock_hist_client.get_stock_latest_quote(
+                StockQuotesRequest(symbol_or_symbols=list(symbols))
+            )
+        except Exception as e:
+            logger.error(f"Error getting latest quotes for {symbols}: {e}")
+            quote_response = {}
+            
+        quotes = {}
+        for symbol in symbols:
+            try:
+                if symbol in quote_response:
+                    quotes[symbol] = self._quote_to_dict(quote_response[symbol])
+                elif (quote := self.get_latest_quote(symbol)) is not None:
+                    quotes[symbol] = quote
+            except Exception as e:
+                logger.error(f"Error reading latest quote for {symbol}: {e}")
+        return quotes
+    
+    @staticmethod
+    def _quote_to_dict(quote) -> Dict:
+        return {
+            'ask_price': float(quote.ask_price),
+            'ask_size': int(quote.ask_size),
+            'bid_price': float(quote.bid_price),
+            'bid_size': int(quote.bid_size),
+            'timestamp': quote.timestamp
+        }
+    
     def get_option_contracts(self, ticker: str, expiration_date_gte: Optional[str] = None, 
                            expiration_date_lte: Optional[str] = None, limit: int = 100) -> List[Dict]:
         """Get option contracts for a ticker with expiration date filters"""
@@ -252,10 +299,15 @@ class AlpacaConnector:
             logger.error("Trading client not initialized")
             return []
             
-        if not expiration_date_gte:
-            expiration_date_gte = datetime.now().strftime('%Y-%m-%d')
-        if not expiration_date_lte:
-            expiration_date_lte = (datetime.now() + timedelta(days=DTE_RANGE[1])).strftime('%Y-%m-%d')
+        if not expiration_date_gte or not expiration_date_lte:
+            default_gte, default_lte = _dte_window(0, DTE_RANGE[1], date.today())
+            expiration_date_gte = expiration_date_gte or default_gte
+            expiration_date_lte = expiration_date_lte or default_lte
+            
+        cache_key = (ticker, expiration_date_gte, expiration_date_lte, limit)
+        cached = self._contracts_cache.get(cache_key)
+        if cached is not None:
+            return cached
             
         try:
             # Get all option contracts for the ticker
@@ -272,13 +324,15 @@ class AlpacaConnector:
             ][:limit]
             
             # Convert to list of dictionaries
-            return [{
+            contracts = [{
                 'ticker': opt.symbol,
                 'strike_price': opt.strike_price,
                 'expiration_date': opt.expiration_date.strftime('%Y-%m-%d'),
                 'contract_type': 'call' if opt.type == 'call' else 'put',
                 'delta': None  # Alpaca doesn't provide delta directly
             } for opt in filtered_options]
+            self._contracts_cache.set(cache_key, contracts)
+            return contracts
             
         except Exception as e:
             logger.error(f"Error getting option contracts for {ticker}: {e}")
@@ -309,16 +363,57 @@ class AlpacaConnector:
             logger.error(f"Error getting option quote for {option_symbol}: {e}")
             return None
     
+    def get_options_snapshot(self, underlying: str) -> Dict[str, Dict]:
+        """
+        Get latest quotes for every option contract on an underlying in one call.
+        
+        Returns:
+            Dict mapping option symbol to a quote dict shaped like get_option_quotes
+        """
+        if not self.option_hist_client:
+            logger.error("Option historical client not initialized")
+            return {}
+            
+        try:
+            chain = self.option_hist_client.get_option_chain(
+                OptionChainRequest(underlying_symbol=underlying)
+            )
+            
+            quotes = {}
+            for option_symbol, snapshot in chain.items():
+                quote = snapshot.latest_quote
+                if quote is None:
+                    continue
+                quotes[option_symbol] = {
+                    'symbol': option_symbol,
+                    'bid_price': quote.bid_price,
+                    'bid_size': quote.bid_size,
+                    'ask_price': quote.ask_price,
+                    'ask_size': quote.ask_size,
+                    'timestamp': quote.timestamp
+                }
+            return quotes
+            
+        except Exception as e:
+            logger.error(f"Error getting options snapshot for {underlying}: {e}")
+            return {}
+    
     def get_real_time_data(self, symbols: List[str] = TRADING_SYMBOLS) -> Dict:
         """Get real-time data for a list of symbols"""
+        cache_key = tuple(symbols)
+        cached = self._real_time_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+            
         quotes = {}
         
-        for symbol in symbols:
-            quote = self.get_latest_quote(symbol)
-            if quote:
-                quotes[symbol] = quote
+        with ThreadPoolExecutor(max_workers=MAX_QUOTE_WORKERS) as executor:
+            for symbol, quote in zip(symbols, executor.map(self.get_latest_quote, symbols)):
+                if quote:
+                    quotes[symbol] = quote
         
-        return quotes
+        self._real_time_cache.set(cache_key, quotes)
+        return dict(quotes)
     
     def _create_fallback_data(self, symbol: str, days_back: int) -> pd.DataFrame:
         """Create fallback data when API calls fail"""
@@ -327,11 +422,11 @@ class AlpacaConnector:
             dates = pd.date_range(end=datetime.now(), periods=days_back, freq='D')
             data = {
                 'date': dates,
-                'open': [100.0] * days_back,
-                'high': [101.0] * days_back,
-                'low': [99.0] * days_back,
-                'close': [100.0] * days_back,
-                'volume': [1000000] * days_back
+                'open': np.full(days_back, 100.0),
+                'high': np.full(days_back, 101.0),
+                'low': np.full(days_back, 99.0),
+                'close': np.full(days_back, 100.0),
+                'volume': np.full(days_back, 1000000, dtype=np.int64)
             }
             return pd.DataFrame(data)
         except Exception as e:
@@ -339,11 +434,17 @@ class AlpacaConnector:
             return pd.DataFrame()
 
     def get_option_historical(self, option_symbol: str, from_date: str, to_date: str, 
-                            timespan: str = 'day') -> pd.DataFrame:
-        """Get historical data for an option contract"""
+                            timespan: str = 'day', as_arrays: bool = False) -> Union[pd.DataFrame, Dict]:
+        """Get historical data for an option contract
+        
+        With as_arrays=True, returns a dict of NumPy arrays ('date' as
+        datetime64[ms], float32 prices, int64 volume) built straight from the
+        bar objects, skipping DataFrame construction for 1h/1d data.
+        """
+        empty = self._empty_option_arrays() if as_arrays else pd.DataFrame()
         if not self.stock_hist_client:
             logger.error("Historical client not initialized")
-            return pd.DataFrame()
+            return empty
             
         try:
             # Map timeframe string to Alpaca TimeFrame object
@@ -371,24 +472,26 @@ class AlpacaConnector:
             # Get the data
             bars_response = self.stock_hist_client.get_stock_bars(bars_request)
             
+            # Hot path: read the bar objects directly into arrays
+            if as_arrays and timespan != '4h':
+                if option_symbol not in bars_response:
+                    logger.warning(f"No bars data found for {option_symbol}")
+                    return empty
+                return self._bars_to_arrays(bars_response[option_symbol])
+            
             # Convert to dataframe
             if option_symbol in bars_response:
                 df = bars_response[option_symbol].df
                 
-                # Standardize column names
-                df = df.rename(columns={
-                    'open': 'open',
-                    'high': 'high',
-                    'low': 'low',
-                    'close': 'close',
-                    'volume': 'volume',
-                    'timestamp': 'date'
-                })
+                # OHLCV columns already carry the right names; only the
+                # timestamp index level needs renaming
+                df.index = df.index.set_names(
+                    ['date' if name == 'timestamp' else name for name in df.index.names]
+                )
                 
                 # Handle 4h resampling if needed
                 if timespan == '4h':
-                    df = df.set_index('date')
-                    df = df.resample('4H').agg({
+                    df = df.resample('4H', level='date').agg({
                         'open': 'first',
                         'high': 'max',
                         'low': 'min',
@@ -396,24 +499,50 @@ class AlpacaConnector:
                         'volume': 'sum'
                     }).dropna()
                     df = df.reset_index()
+                    if as_arrays:
+                        return {
+                            'date': df['date'].to_numpy(dtype='datetime64[ns]').astype('datetime64[ms]'),
+                            'open': df['open'].to_numpy(dtype=np.float32),
+                            'high': df['high'].to_numpy(dtype=np.float32),
+                            'low': df['low'].to_numpy(dtype=np.float32),
+                            'close': df['close'].to_numpy(dtype=np.float32),
+                            'volume': df['volume'].to_numpy(dtype=np.int64)
+                        }
                 
                 return df
             else:
                 logger.warning(f"No bars data found for {option_symbol}")
-                return pd.DataFrame()
+                return empty
                 
         except Exception as e:
             logger.error(f"Error getting historical bars for {option_symbol}: {e}")
-            return pd.DataFrame()
+            return empty
+    
+    @staticmethod
+    def _bars_to_arrays(bars) -> Dict[str, np.ndarray]:
+        """Column arrays from a list of alpaca-py Bar objects"""
+        n = len(bars)
+        return {
+            'date': np.fromiter((int(bar.timestamp.timestamp() * 1000) for bar in bars),
+                                dtype=np.int64, count=n).view('datetime64[ms]'),
+            'open': np.fromiter((bar.open for bar in bars), dtype=np.float32, count=n),
+            'high': np.fromiter((bar.high for bar in bars), dtype=np.float32, count=n),
+            'low': np.fromiter((bar.low for bar in bars), dtype=np.float32, count=n),
+            'close': np.fromiter((bar.close for bar in bars), dtype=np.float32, count=n),
+            'volume': np.fromiter((bar.volume for bar in bars), dtype=np.int64, count=n)
+        }
+    
+    @staticmethod
+    def _empty_option_arrays() -> Dict[str, np.ndarray]:
+        """Empty result in the shape get_option_historical(as_arrays=True) returns"""
+        return AlpacaConnector._bars_to_arrays([])
     
     def filter_options_by_criteria(self, ticker: str, option_type: str = 'call', 
                                  dte_min: int = DTE_RANGE[0], dte_max: int = DTE_RANGE[1],
                                  delta_min: float = DELTA_RANGE[0], delta_max: float = DELTA_RANGE[1]) -> List[Dict]:
         """Filter options by criteria - DTE range, delta range, etc."""
         # Get near-term expiration dates within DTE range
-        now = datetime.now()
-        min_date = (now + timedelta(days=dte_min)).strftime('%Y-%m-%d')
-        max_date = (now + timedelta(days=dte_max)).strftime('%Y-%m-%d')
+        min_date, max_date = _dte_window(dte_min, dte_max, date.today())
         
         contracts = self.get_option_contracts(ticker, min_date, max_date)
         
@@ -428,30 +557,51 @@ class AlpacaConnector:
     def scan_for_option_opportunities(self) -> List[Dict]:
         """Scan for option opportunities based on configured parameters"""
         opportunities = []
+        candidates = []
+        
+        min_date, max_date = _dte_window(DTE_RANGE[0], DTE_RANGE[1], date.today())
         
         for symbol in TRADING_SYMBOLS:
+            # One snapshot call returns quotes for the whole chain
+            snapshot = self.get_options_snapshot(symbol)
+            
+            # get_option_contracts returns calls and puts together, so fetch
+            # once per symbol and split by type client-side
+            contracts_by_type = {option_type.lower(): [] for option_type in OPTION_TYPES}
+            for contract in self.get_option_contracts(symbol, min_date, max_date):
+                bucket = contracts_by_type.get(contract['contract_type'].lower())
+                if bucket is not None:
+                    bucket.append(contract)
+            
             for option_type in OPTION_TYPES:
-                # Get filtered option contracts
-                contracts = self.filter_options_by_criteria(symbol, option_type)
-                
-                for contract in contracts:
-                    # Get current option price
-                    quote = self.get_option_quotes(contract['ticker'])
-                    if quote:
-                        opportunity = {
-                            'symbol': symbol,
-                            'option_symbol': contract['ticker'],
-                            'contract_type': option_type,
-                            'strike': contract['strike_price'],
-                            'expiration': contract['expiration_date'],
-                            'premium': quote['bid_price']  # Use bid price as conservative estimate
-                        }
-                        opportunities.append(opportunity)
+                for contract in contracts_by_type[option_type.lower()]:
+                    candidates.append((symbol, option_type, contract, snapshot.get(contract['ticker'])))
+        
+        # Only contracts missing from the snapshot need an individual lookup
+        missing = [contract['ticker'] for _, _, contract, quote in candidates if quote is None]
+        fetched = {}
+        if missing:
+            with ThreadPoolExecutor(max_workers=MAX_QUOTE_WORKERS) as executor:
+                fetched = dict(zip(missing, executor.map(self.get_option_quotes, missing)))
+        
+        for symbol, option_type, contract, quote in candidates:
+            if quote is None:
+                quote = fetched.get(contract['ticker'])
+            if quote:
+                opportunity = {
+                    'symbol': symbol,
+                    'option_symbol': contract['ticker'],
+                    'contract_type': option_type,
+                    'strike': contract['strike_price'],
+                    'expiration': contract['expiration_date'],
+                    'premium': quote['bid_price']  # Use bid price as conservative estimate
+                }
+                opportunities.append(opportunity)
         
         return opportunities
 
     def get_historical_data(self, symbol: str, timeframe: str = '1d', 
-                          days_back: int = 30) -> Dict[str, List]:
+                          days_back: int = 30, as_arrays: bool = False) -> Dict[str, List]:
         """
         Get historical price data for a symbol.
         
@@ -459,9 +609,11 @@ class AlpacaConnector:
             symbol: The stock symbol
             timeframe: The timeframe for the data (1d, 1h, 4h)
             days_back: Number of days of historical data to fetch
+            as_arrays: Return NumPy arrays (float32 prices, int64 volumes)
+                instead of Python lists, skipping the per-element conversion
             
         Returns:
-            Dictionary containing lists of prices, volumes, and timestamps
+            Dictionary containing lists (or arrays) of prices, volumes, and timestamps
         """
         try:
             end_date = datetime.now()
@@ -476,9 +628,15 @@ class AlpacaConnector:
             
             if df.empty:
                 logger.warning(f"No historical data found for {symbol}")
-                return {'prices': [], 'volumes': [], 'timestamps': []}
+                return self._empty_historical_data(as_arrays)
                 
             logger.info(f"Fetched {len(df)} bars of historical data for {symbol}")
+            if as_arrays:
+                return {
+                    'prices': df['close'].to_numpy(dtype=np.float32),
+                    'volumes': df['volume'].to_numpy(dtype=np.int64),
+                    'timestamps': df.index.to_numpy()
+                }
             return {
                 'prices': df['close'].tolist(),
                 'volumes': df['volume'].tolist(),
@@ -486,4 +644,15 @@ class AlpacaConnector:
             }
         except Exception as e:
             logger.error(f"Error getting historical data for {symbol}: {e}")
-            return {'prices': [], 'volumes': [], 'timestamps': []}
+            return self._empty_historical_data(as_arrays)
+
+    @staticmethod
+    def _empty_historical_data(as_arrays: bool) -> Dict:
+        """Empty result in the same shape get_historical_data returns"""
+        if as_arrays:
+            return {
+                'prices': np.empty(0, dtype=np.float32),
+                'volumes': np.empty(0, dtype=np.int64),
+                'timestamps': np.empty(0, dtype=object)
+            }
+        return {'prices': [], 'volumes': [], 'timestamps': []}
@@ -5,8 +5,22 @@ logger = logging.getLogger(__name__)
 class ConfidenceFilter:
     """Filters signals based on confidence levels and additional criteria"""
     
-    def apply_filters(self, symbol, direction, confidence, sentiment_data, technical_data):
-        """Apply filters to determine if signal should be acted upon"""
+    @staticmethod
+    def classify_timeframe(bulls, bears):
+        """Label a timeframe strongly bullish, strongly bearish or neutral"""
+        if bulls > bears * 2:  # Strongly bullish
+            return 'bullish'
+        if bears > bulls * 2:  # Strongly bearish
+            return 'bearish'
+        return 'neutral'
+    
+    def apply_filters(self, symbol, direction, confidence, sentiment_data, technical_data,
+                      timeframe_directions=None):
+        """Apply filters to determine if signal should be acted upon
+        
+        timeframe_directions may carry per-timeframe labels already computed
+        by the caller, so technical_data does not have to be walked again.
+        """
         result = {
             'pass': True,
             'reason': None
@@ -20,15 +34,16 @@ class ConfidenceFilter:
             return result
             
         # Check minimum article count for sentiment if available
-        if sentiment_data and 'article_count' in sentiment_data:
-            if sentiment_data['article_count'] < 2:
-                result['pass'] = False
-                result['reason'] = f"Insufficient news coverage: {sentiment_data['article_count']} articles"
-                return result
+        article_count = (sentiment_data or {}).get('article_count')
+        if article_count is not None and article_count < 2:
+            result['pass'] = False
+            result['reason'] = f"Insufficient news coverage: {article_count} articles"
+            return result
         
         # Check for conflicting signals across timeframes
         if technical_data:
-            conflicting = self._check_conflicting_timeframes(technical_data, direction)
+            conflicting = self._check_conflicting_timeframes(technical_data, direction,
+                                                             timeframe_directions)
             if conflicting:
                 result['pass'] = False
                 result['reason'] = "Conflicting signals across timeframes"
@@ -37,35 +52,32 @@ class ConfidenceFilter:
         # All filters passed
         return result
     
-    def _check_conflicting_timeframes(self, technical_data, direction):
+    def _check_conflicting_timeframes(self, technical_data, direction, timeframe_directions=None):
         """Check if there are conflicting signals across different timeframes"""
         # For bullish signal, check if any timeframe is strongly bearish
         # For bearish signal, check if any timeframe is strongly bullish
-        timeframe_directions = {}
-        
-        for timeframe, data in technical_data.items():
-            if 'bullish_signals' in data and 'bearish_signals' in data:
-                bulls = data['bullish_signals']
-                bears = data['bearish_signals']
-                
+        if timeframe_directions is not None:
+            directions = set(timeframe_directions.values())
+            has_bullish = 'bullish' in directions
+            has_bearish = 'bearish' in directions
+        else:
+            # Single pass, stopping as soon as both strong directions are seen
+            has_bullish = has_bearish = False
+            for data in technical_data.values():
+                bulls = data.get('bullish_signals')
+                bears = data.get('bearish_signals')
+                if bulls is None or bears is None:
+                    continue
                 if bulls > bears * 2:  # Strongly bullish
-                    timeframe_directions[timeframe] = 'bullish'
+                    has_bullish = True
                 elif bears > bulls * 2:  # Strongly bearish
-                    timeframe_directions[timeframe] = 'bearish'
-                else:
-                    timeframe_directions[timeframe] = 'neutral'
+                    has_bearish = True
+                if has_bullish and has_bearish:
+                    break
         
         # Check if we have both strongly bullish and strongly bearish signals
-        has_bullish = any(d == 'bullish' for d in timeframe_directions.values())
-        has_bearish = any(d == 'bearish' for d in timeframe_directions.values())
-        
         if has_bullish and has_bearish:
             return True
             
         # Check if the signal direction conflicts with a strong signal in a timeframe
-        if direction == 'bullish' and has_bearish:
-            return True
-        if direction == 'bearish' and has_bullish:
-            return True
-            
-        return False
+        return (direction == 'bullish' and has_bearish) or (direction == 'bearish' and has_bullish)
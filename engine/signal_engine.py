@@ -21,7 +21,29 @@ class SignalEngine:
         self.confidence_filter = ConfidenceFilter()
         self.trade_formatter = TradeFormatter()
     
-    def _calculate_signal_score(self, sentiment_data, technical_data):
+    def _analyze_technical(self, technical_data):
+        """Single pass over technical_data producing signal totals and
+        per-timeframe directions for both scoring and conflict filtering"""
+        rows = []
+        directions = {}
+        for timeframe, data in technical_data.items():
+            if 'bullish_signals' in data and 'bearish_signals' in data:
+                bulls = data['bullish_signals']
+                bears = data['bearish_signals']
+                rows.append((bulls, bears))
+                directions[timeframe] = ConfidenceFilter.classify_timeframe(bulls, bears)
+        
+        # One (bullish, bearish) row per timeframe reduced in a single sum
+        counts = np.array(rows, dtype=np.float64).reshape(-1, 2)
+        bull_sum, bear_sum = counts.sum(axis=0)
+        return {
+            'timeframe_count': len(rows),
+            'bull_sum': float(bull_sum),
+            'bear_sum': float(bear_sum),
+            'directions': directions
+        }
+    
+    def _calculate_signal_score(self, sentiment_data, technical_data, technical_summary=None):
         """Calculate a combined signal score from sentiment and technical data"""
         # Default scores
         sentiment_score = 0.5  # Neutral
@@ -35,17 +57,12 @@ class SignalEngine:
         # Process technical data if available
         if technical_data:
             # Calculate average bullish vs bearish signals across timeframes
-            bullish_signals = 0
-            bearish_signals = 0
-            timeframe_count = 0
-            
-            for timeframe, data in technical_data.items():
-                if 'bullish_signals' in data and 'bearish_signals' in data:
-                    bullish_signals += data['bullish_signals']
-                    bearish_signals += data['bearish_signals']
-                    timeframe_count += 1
+            if technical_summary is None:
+                technical_summary = self._analyze_technical(technical_data)
             
-            if timeframe_count > 0:
+            if technical_summary['timeframe_count'] > 0:
+                bullish_signals = technical_summary['bull_sum']
+                bearish_signals = technical_summary['bear_sum']
                 total_signals = bullish_signals + bearish_signals
                 if total_signals > 0:
                     # Normalize to 0 to 1 range
@@ -79,8 +96,11 @@ class SignalEngine:
         logger.info(f"Generating signals for {symbol}")
         
         try:
+            # Walk the technical data once for both scoring and filtering
+            technical_summary = self._analyze_technical(technical_data) if technical_data else None
+            
             # Calculate signal score
-            scores = self._calculate_signal_score(sentiment_data, technical_data)
+            scores = self._calculate_signal_score(sentiment_data, technical_data, technical_summary)
             combined_score = scores['combined']
             
             # Normalize score to confidence level (0 to 1)
@@ -96,17 +116,21 @@ class SignalEngine:
                 return []
             
             # Apply confidence filtering
-            confidence_result = self.confidence_filter.apply_filters(symbol, direction, confidence, 
-                                                                   sentiment_data, technical_data)
+            confidence_result = self.confidence_filter.apply_filters(
+                symbol, direction, confidence, sentiment_data, technical_data,
+                timeframe_directions=technical_summary['directions'] if technical_summary else None
+            )
             
             if not confidence_result['pass']:
                 logger.info(f"Signal for {symbol} filtered out: {confidence_result['reason']}")
                 return []
             
             # Create signal
+            now = datetime.now()
             signal = {
                 'symbol': symbol,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now,
+                'formatted_time': now.strftime('%Y-%m-%d %H:%M:%S'),
                 'direction': direction,
                 'option_type': option_type,
                 'confidence': confidence,
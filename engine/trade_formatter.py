@@ -3,16 +3,34 @@ from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Confidence thresholds, highest first; the last entry catches everything else
+_CONFIDENCE_EMOJIS = (
+    (0.9, "⭐⭐⭐⭐⭐"),
+    (0.8, "⭐⭐⭐⭐"),
+    (0.7, "⭐⭐⭐"),
+    (0.6, "⭐⭐"),
+    (float('-inf'), "⭐"),
+)
+
+_DIRECTION_TEXT = {'bullish': "BULLISH", 'bearish': "BEARISH"}
+
 class TradeFormatter:
     """Formats trade signals for output to different destinations"""
     
     def format_trade_signal(self, signal):
-        """Format a trade signal for output"""
-        # Add additional fields for display
-        formatted = signal.copy()
+        """Format a trade signal for output
+        
+        Display fields are added to the signal dict in place. SignalEngine
+        supplies 'formatted_time'; it is only derived here when missing.
+        """
+        formatted = signal
         
         # Add formatted timestamp
-        formatted['formatted_time'] = datetime.fromisoformat(signal['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+        if 'formatted_time' not in formatted:
+            timestamp = signal['timestamp']
+            if isinstance(timestamp, str):
+                timestamp = datetime.fromisoformat(timestamp)
+            formatted['formatted_time'] = timestamp.strftime('%Y-%m-%d %H:%M:%S')
         
         # Add confidence level as percentage
         formatted['confidence_pct'] = f"{signal['confidence'] * 100:.1f}%"
@@ -21,23 +39,21 @@ class TradeFormatter:
         formatted['formatted_stop_loss'] = [f"{sl*100:.1f}%" for sl in signal['stop_loss_levels']]
         formatted['formatted_profit_targets'] = [f"+{tp*100:.1f}%" for tp in signal['take_profit_levels']]
         
+        # Add emoji indicators (the summary uses them)
+        formatted['direction_emoji'] = "🚀" if signal['direction'] == 'bullish' else "🐻"
+        formatted['confidence_emoji'] = self._get_confidence_emoji(signal['confidence'])
+        
         # Create a summary message
-        summary = self._create_summary(formatted)
-        formatted['summary'] = summary
+        formatted['summary'] = self._create_summary(formatted)
         
         # Create detailed analysis
-        details = self._create_details(formatted)
-        formatted['details'] = details
-        
-        # Add emoji indicators
-        formatted['direction_emoji'] = "🚀" if signal['direction'] == 'bullish' else "🐻"
-        formatted['confidence_emoji'] = self._get_confidence_emoji(signal['confidence'])
+        formatted['details'] = self._create_details(formatted)
         
         return formatted
     
     def _create_summary(self, signal):
         """Create a summary message for the signal"""
-        direction_text = "BULLISH" if signal['direction'] == 'bullish' else "BEARISH"
+        direction_text = _DIRECTION_TEXT.get(signal['direction'], "BEARISH")
         emoji = signal['direction_emoji']
         option_type = signal['option_type'].upper()
         
@@ -55,59 +71,50 @@ class TradeFormatter:
     def _create_details(self, signal):
         """Create detailed analysis for the signal"""
         # Create a section with technical indicators
-        technical_section = "TECHNICAL ANALYSIS:\n"
-        if 'analysis' in signal and 'technical' in signal['analysis']:
-            tech_data = signal['analysis']['technical']
+        analysis = signal.get('analysis') or {}
+        technical_parts = ["TECHNICAL ANALYSIS:\n"]
+        if (tech_data := analysis.get('technical')) is not None:
             for timeframe, data in tech_data.items():
-                technical_section += f"- {timeframe.upper()}: "
-                if 'bullish_signals' in data and 'bearish_signals' in data:
-                    technical_section += f"Bull: {data['bullish_signals']}, Bear: {data['bearish_signals']}"
-                    if 'neutral_signals' in data:
-                        technical_section += f", Neutral: {data['neutral_signals']}"
-                technical_section += "\n"
+                technical_parts.append(f"- {timeframe.upper()}: ")
+                bulls = data.get('bullish_signals')
+                bears = data.get('bearish_signals')
+                if bulls is not None and bears is not None:
+                    technical_parts.append(f"Bull: {bulls}, Bear: {bears}")
+                    if (neutral := data.get('neutral_signals')) is not None:
+                        technical_parts.append(f", Neutral: {neutral}")
+                technical_parts.append("\n")
                 
                 # Add top indicators if available
-                if 'indicators' in data:
-                    for indicator, ind_data in data['indicators'].items():
-                        if 'value' in ind_data and 'signal' in ind_data:
-                            technical_section += f"  • {indicator.upper()}: {ind_data['value']:.2f} ({ind_data['signal']})\n"
+                for indicator, ind_data in data.get('indicators', {}).items():
+                    value = ind_data.get('value')
+                    ind_signal = ind_data.get('signal')
+                    if value is not None and ind_signal is not None:
+                        technical_parts.append(f"  • {indicator.upper()}: {value:.2f} ({ind_signal})\n")
         
         # Create a section with sentiment analysis
-        sentiment_section = "SENTIMENT ANALYSIS:\n"
-        if 'analysis' in signal and 'sentiment' in signal['analysis']:
-            sent_data = signal['analysis']['sentiment']
-            if 'overall_score' in sent_data:
-                sentiment_section += f"- Overall Score: {sent_data['overall_score']:.2f}\n"
-            if 'sentiment_label' in sent_data:
-                sentiment_section += f"- Sentiment: {sent_data['sentiment_label'].upper()}\n"
-            if 'article_count' in sent_data:
-                sentiment_section += f"- Article Count: {sent_data['article_count']}\n"
+        sentiment_parts = ["SENTIMENT ANALYSIS:\n"]
+        if (sent_data := analysis.get('sentiment')) is not None:
+            if (score := sent_data.get('overall_score')) is not None:
+                sentiment_parts.append(f"- Overall Score: {score:.2f}\n")
+            if (label := sent_data.get('sentiment_label')) is not None:
+                sentiment_parts.append(f"- Sentiment: {label.upper()}\n")
+            if (count := sent_data.get('article_count')) is not None:
+                sentiment_parts.append(f"- Article Count: {count}\n")
             
             # Add keyword matches if available
-            if 'keyword_matches' in sent_data:
-                keyword_matches = sent_data['keyword_matches']
-                if keyword_matches:
-                    sentiment_section += "- Top Keywords:\n"
-                    # Sort keywords by count and get top 5
-                    top_keywords = sorted(keyword_matches.items(), key=lambda x: x[1], reverse=True)[:5]
-                    for keyword, count in top_keywords:
-                        if count > 0:
-                            sentiment_section += f"  • {keyword}: {count} mentions\n"
+            if keyword_matches := sent_data.get('keyword_matches'):
+                sentiment_parts.append("- Top Keywords:\n")
+                # Sort keywords by count and get top 5
+                top_keywords = sorted(keyword_matches.items(), key=lambda x: x[1], reverse=True)[:5]
+                for keyword, count in top_keywords:
+                    if count > 0:
+                        sentiment_parts.append(f"  • {keyword}: {count} mentions\n")
         
         # Combine sections
-        details = technical_section + "\n" + sentiment_section
+        details = "".join(technical_parts) + "\n" + "".join(sentiment_parts)
         
         return details
     
     def _get_confidence_emoji(self, confidence):
         """Get emoji indicator for confidence level"""
-        if confidence >= 0.9:
-            return "⭐⭐⭐⭐⭐"
-        elif confidence >= 0.8:
-            return "⭐⭐⭐⭐"
-        elif confidence >= 0.7:
-            return "⭐⭐⭐"
-        elif confidence >= 0.6:
-            return "⭐⭐"
-        else:
-            return "⭐"
+        return next(emoji for threshold, emoji in _CONFIDENCE_EMOJIS if confidence >= threshold)
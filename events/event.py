@@ -1,50 +1,56 @@
-from enum import Enum
-from typing import Dict, Any
+import sys
+import time
+from enum import IntEnum
+from dataclasses import dataclass, field
+from typing import Dict, Any, Tuple
 from datetime import datetime
 
-class EventPriority(Enum):
-    """Priority levels for events"""
+# Offset from the monotonic clock to wall-clock epoch time, captured once so
+# event timestamps can stay cheap monotonic integers
+_WALL_CLOCK_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+class EventPriority(IntEnum):
+    """Priority levels for events; plain ints, so they compare natively"""
     LOW = 1
     MEDIUM = 2
     HIGH = 3
     CRITICAL = 4
 
+@dataclass(slots=True, frozen=True, order=True)
 class Event:
-    """Event class for the event system"""
+    """
+    Event class for the event system
     
-    def __init__(self, event_type: str, priority: EventPriority = EventPriority.MEDIUM, 
-                 data: Dict[str, Any] = None, timestamp: datetime = None, source: str = None):
-        """
-        Initialize an event
-        
-        Args:
-            event_type: Type of event (e.g., 'price_update', 'news_update')
-            priority: Priority level of the event
-            data: Event data dictionary
-            timestamp: Event timestamp (defaults to current time)
-            source: Source of the event
-        """
-        self.event_type = event_type
-        self.priority = priority
-        self.data = data or {}
-        self.timestamp = timestamp or datetime.now()
-        self.source = source
-        
-    def __lt__(self, other):
-        """Less than comparison for priority queue ordering"""
-        if not isinstance(other, Event):
-            return NotImplemented
-        # Compare by priority first, then timestamp
-        if self.priority.value != other.priority.value:
-            return self.priority.value < other.priority.value
-        return self.timestamp < other.timestamp
-        
-    def __eq__(self, other):
-        """Equality comparison"""
-        if not isinstance(other, Event):
-            return NotImplemented
-        return (self.priority.value == other.priority.value and 
-                self.timestamp == other.timestamp)
+    Attributes:
+        event_type: Type of event (e.g., 'price_update', 'news_update')
+        priority: Priority level of the event
+        data: Event data dictionary
+        timestamp: Event time in time.monotonic_ns() nanoseconds (defaults to now)
+        source: Source of the event
+    
+    Events order by a precomputed (-priority, timestamp) key, so the highest
+    priority, oldest event sorts first in a heap. Use wall_clock for display.
+    """
+    event_type: str = field(compare=False)
+    priority: EventPriority = field(default=EventPriority.MEDIUM, compare=False)
+    data: Dict[str, Any] = field(default=None, compare=False)
+    timestamp: int = field(default=None, compare=False)
+    source: str = field(default=None, compare=False)
+    _sort_key: Tuple[int, int] = field(init=False, repr=False, compare=True)
+    
+    def __post_init__(self):
+        # Frozen dataclass: defaults have to be filled in via object.__setattr__
+        object.__setattr__(self, 'event_type', sys.intern(self.event_type))
+        if self.data is None:
+            object.__setattr__(self, 'data', {})
+        if self.timestamp is None:
+            object.__setattr__(self, 'timestamp', time.monotonic_ns())
+        object.__setattr__(self, '_sort_key', (-int(self.priority), self.timestamp))
+    
+    @property
+    def wall_clock(self) -> datetime:
+        """Local wall-clock time the event was created, for display"""
+        return datetime.fromtimestamp((self.timestamp + _WALL_CLOCK_OFFSET_NS) / 1e9)
         
     def __str__(self) -> str:
         """String representation of the event"""
@@ -55,5 +61,5 @@ class Event:
         return (f"Event(event_type='{self.event_type}', "
                 f"priority=EventPriority.{self.priority.name}, "
                 f"data={self.data}, "
-                f"timestamp={self.timestamp}, "
-                f"source='{self.source}')") 
\ No newline at end of file
+                f"timestamp={self.wall_clock}, "
+                f"source='{self.source}')")
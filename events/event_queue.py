@@ -1,48 +1,25 @@
 import asyncio
+import heapq
 import logging
+import sys
 from typing import Dict, Any, Callable, Optional
-from enum import Enum
-from dataclasses import dataclass
-from datetime import datetime
-from functools import total_ordering
 from events.event import Event, EventPriority
 
 logger = logging.getLogger(__name__)
 
-class EventPriority(Enum):
-    LOW = 1
-    MEDIUM = 2
-    HIGH = 3
-    CRITICAL = 4
-
-@dataclass
-class Event:
-    event_type: str
-    data: Dict[str, Any]
-    priority: EventPriority
-    timestamp: datetime
-    source: str
-
-    def __lt__(self, other):
-        if not isinstance(other, Event):
-            return NotImplemented
-        # Compare only by priority first, then timestamp
-        if self.priority.value != other.priority.value:
-            return self.priority.value < other.priority.value
-        return self.timestamp < other.timestamp
-
-    def __eq__(self, other):
-        if not isinstance(other, Event):
-            return NotImplemented
-        return (self.priority.value == other.priority.value and 
-                self.timestamp == other.timestamp)
-
 class EventQueue:
     """Manages event flow and processing"""
     
+    # Events popped per dispatch pass; anything beyond waits for the next one
+    MAX_BATCH = 16
+    
     def __init__(self):
-        self.queue = asyncio.PriorityQueue()
-        self.handlers: Dict[str, list[Callable]] = {}
+        # Plain heap + wakeup event: a single consumer on one loop needs no
+        # locking, so asyncio.PriorityQueue's lock/future machinery is skipped
+        self._heap: list[Event] = []
+        self._wake = asyncio.Event()
+        # Handler tuples keyed by interned event type
+        self.handlers: Dict[str, tuple[Callable, ...]] = {}
         self.running = False
         self.processing_tasks = set()
         
@@ -57,50 +34,66 @@ class EventQueue:
         """Stop the event queue processing"""
         logger.info("Stopping event queue...")
         self.running = False
+        self._wake.set()
         await asyncio.gather(*self.processing_tasks)
         logger.info("Event queue stopped")
         
     def register_handler(self, event_type: str, handler: Callable):
         """Register a handler for a specific event type"""
-        if event_type not in self.handlers:
-            self.handlers[event_type] = []
-        self.handlers[event_type].append(handler)
-        logger.info(f"Registered handler for event type: {event_type}")
+        event_type = sys.intern(event_type)
+        self.handlers[event_type] = self.handlers.get(event_type, ()) + (handler,)
+        logger.info("Registered handler for event type: %s", event_type)
         
     async def publish(self, event: Event):
         """Publish an event to the queue"""
-        logger.info(f"Publishing event: {event.event_type} from {event.source}")
-        await self.queue.put(event)
-        logger.info(f"Event published: {event.event_type}")
+        logger.info("Publishing event: %s from %s", event.event_type, event.source)
+        heapq.heappush(self._heap, event)
+        self._wake.set()
         
     async def _process_events(self):
         """Process events from the queue"""
         logger.info("Starting event processing loop")
         while self.running:
             try:
-                event = await self.queue.get()
-                logger.info(f"Processing event: {event.event_type} from {event.source}")
+                if not self._heap:
+                    await self._wake.wait()
+                    self._wake.clear()
+                    continue
                 
-                if event.event_type in self.handlers:
-                    for handler in self.handlers[event.event_type]:
-                        logger.info(f"Executing handler for event: {event.event_type}")
-                        task = asyncio.create_task(self._execute_handler(handler, event))
-                        self.processing_tasks.add(task)
-                        task.add_done_callback(self.processing_tasks.discard)
-                else:
-                    logger.warning(f"No handlers registered for event type: {event.event_type}")
+                # Drain up to MAX_BATCH queued events (in priority order) and
+                # dispatch them as one batch
+                batch = [heapq.heappop(self._heap) for _ in range(min(len(self._heap), self.MAX_BATCH))]
+                handler_calls = []
+                for event in batch:
+                    logger.info("Processing event: %s from %s", event.event_type, event.source)
+                    handlers = self.handlers.get(event.event_type)
+                    if handlers:
+                        handler_calls.extend(self._execute_handler(handler, event) for handler in handlers)
+                    else:
+                        logger.warning("No handlers registered for event type: %s", event.event_type)
+                
+                if handler_calls:
+                    # Tracked only so stop() can wait for in-flight handlers
+                    dispatch = asyncio.gather(*handler_calls)
+                    self.processing_tasks.add(dispatch)
+                    dispatch.add_done_callback(self.processing_tasks.discard)
+                
+                if self._heap:
+                    # Let the dispatched handlers run before the next batch
+                    await asyncio.sleep(0)
                     
             except Exception as e:
-                logger.error(f"Error processing event: {e}")
-                
+                logger.error("Error processing event: %s", e)
+    
     async def _execute_handler(self, handler: Callable, event: Event):
         """Execute a handler for an event"""
         try:
-            logger.info(f"Executing handler for event: {event.event_type}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Executing handler for event: %s", event.event_type)
             await handler(event)
-            logger.info(f"Handler completed for event: {event.event_type}")
+            logger.debug("Handler completed for event: %s", event.event_type)
         except Exception as e:
-            logger.error(f"Error in event handler: {e}")
+            logger.error("Error in event handler: %s", e)
             
     async def publish_price_update(self, symbol: str, price: float, volume: int, change: float):
         """Helper method to publish price updates"""
@@ -114,10 +107,9 @@ class EventQueue:
                 "change": change
             },
             priority=priority,
-            timestamp=datetime.now(),
             source="price_monitor"
         )
-        logger.info(f"Publishing price update for {symbol}: ${price:.2f} (Change: {change:.2%})")
+        logger.info("Publishing price update for %s: $%.2f (Change: %.2f%%)", symbol, price, change * 100)
         await self.publish(event)
         
     async def publish_news_update(self, symbol: str, article: Dict[str, Any]):
@@ -126,8 +118,7 @@ class EventQueue:
             event_type="news_update",
             data={"symbol": symbol, "article": article},
             priority=EventPriority.MEDIUM,
-            timestamp=datetime.now(),
             source="news_monitor"
         )
-        logger.info(f"Publishing news update for {symbol}")
+        logger.info("Publishing news update for %s", symbol)
         await self.publish(event) 
\ No newline at end of file
@@ -1,34 +1,166 @@
 import asyncio
 import logging
-import json
+from functools import lru_cache
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
-import os
+from datetime import date, timedelta
+import time
 
+import httpx
 import openai
+import orjson
 from events.event_queue import EventQueue, Event, EventPriority
 from alerts.discord_webhook import DiscordWebhook
+from utils.helpers import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Static prompt blocks are module constants so every request shares a
+# byte-identical prefix (eligible for OpenAI prompt caching); per-symbol data
+# always goes in the final message.
+SYSTEM_PROMPT = (
+    "You are an expert options trader explaining complex concepts to complete beginners. "
+    "Use simple language, analogies, and clear explanations that anyone can understand. "
+    "Avoid technical jargon, and when you must use it, explain what it means in plain English."
+)
+
+STATIC_INSTRUCTIONS = (
+    "Analyze the symbol in the next message for options swing trading using the box method. "
+    "Provide specific entry/exit points and a brief analysis.\n\n"
+    "Field notes:\n"
+    "RSI: Relative Strength Index - measures overbought/oversold conditions\n"
+    "MACD: Moving Average Convergence Divergence - trend momentum\n"
+    "Bollinger Bands: upper | middle | lower price volatility bands\n\n"
+    "Provide:\n"
+    "1. Clear entry/exit points using the box method\n"
+    "2. Brief technical analysis (max 2 sentences)\n"
+    "3. Beginner-friendly explanation (2-3 sentences):\n"
+    "   - Explain what the analysis means in simple terms\n"
+    "   - Avoid technical jargon\n"
+    "   - Use analogies if helpful (e.g., 'like a rubber band stretching')\n"
+    "   - Explain why we're choosing calls or puts\n"
+    "4. Confidence level (High/Medium/Low) with a simple reason why\n"
+    "5. Key price levels to watch"
+)
+
+# Per-symbol data message; the only part of the request that varies
+_PROMPT_TEMPLATE = (
+    "Symbol: {symbol}\n"
+    "Technical Data:\n"
+    "RSI: {rsi}\n"
+    "MACD: {macd}\n"
+    "Bollinger Bands: {bb_upper} | {bb_middle} | {bb_lower}\n"
+    "Sentiment: {sentiment_label} ({sentiment_score})"
+)
+
+@lru_cache(maxsize=1)
+def _weekly_expiration(today: date) -> str:
+    """Next Friday's expiration as MM-DD-YY (a week out if today is Friday or later)"""
+    days_ahead = 4 - today.weekday()  # 4 is Friday
+    if days_ahead <= 0:  # If today is Friday or later in the week
+        days_ahead += 7
+    return (today + timedelta(days=days_ahead)).strftime('%m-%d-%y')
+
+def _price_levels(*names: str) -> Dict[str, Any]:
+    """Strict JSON schema for an object of named price levels"""
+    return {
+        "type": "object",
+        "properties": {name: {"type": "number"} for name in names},
+        "required": list(names),
+        "additionalProperties": False
+    }
+
+# Structured output schema; replaces the free-form "Format as JSON" trailer
+SIGNAL_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "options_signal",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "entry_points": _price_levels("bullish", "bearish"),
+                "exit_points": _price_levels("target", "stop"),
+                "analysis": {"type": "string"},
+                "simplified_analysis": {"type": "string"},
+                "confidence": {"type": "string", "enum": ["High", "Medium", "Low"]},
+                "confidence_reason": {"type": "string"},
+                "key_levels": _price_levels("support", "resistance")
+            },
+            "required": [
+                "entry_points", "exit_points", "analysis", "simplified_analysis",
+                "confidence", "confidence_reason", "key_levels"
+            ],
+            "additionalProperties": False
+        }
+    }
+}
+
+def _bucket(value: Any, step: float) -> Optional[float]:
+    """Quantize a numeric feature to a step; None for missing/non-numeric values"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return round(value / step) * step
+
+class ResponseCache(TTLCache):
+    """In-process cache of OpenAI analyses keyed on quantized input features
+    
+    Inputs that land in the same buckets (RSI to the unit, MACD to 0.01,
+    same sentiment label, Bollinger width and middle to 5) reuse the stored
+    analysis instead of making another completion request.
+    """
+    
+    def __init__(self, ttl: float, maxsize: int = 256):
+        super().__init__(maxsize, ttl)
+        
+    @staticmethod
+    def make_key(symbol: str, technical_data: Dict[str, Any], sentiment_data: Dict[str, Any]) -> tuple:
+        bollinger = technical_data.get('bollinger_bands') or {}
+        upper, lower = bollinger.get('upper'), bollinger.get('lower')
+        width = upper - lower if _bucket(upper, 1) is not None and _bucket(lower, 1) is not None else None
+        return (
+            symbol,
+            _bucket(technical_data.get('rsi'), 1),
+            _bucket(technical_data.get('macd'), 0.01),
+            sentiment_data.get('sentiment_label'),
+            _bucket(width, 5),
+            _bucket(bollinger.get('middle'), 5)
+        )
+
 class SignalGenerator:
     """Generates trading signals using OpenAI"""
     
-    def __init__(self, event_queue: EventQueue, openai_api_key: str):
+    def __init__(self, event_queue: EventQueue, openai_api_key: str,
+                 http_client: Optional[httpx.AsyncClient] = None):
         self.event_queue = event_queue
-        # Set the API key in the environment
-        os.environ["OPENAI_API_KEY"] = openai_api_key
-        openai.api_key = openai_api_key
-        self.discord_webhook = DiscordWebhook()
-        self.model = "gpt-3.5-turbo"
-        self.last_signals: Dict[str, datetime] = {}
+        # Async client so completion requests don't block the event loop; the
+        # key is passed explicitly and the bound create method is kept
+        self.client = openai.AsyncOpenAI(api_key=openai_api_key, http_client=http_client)
+        self._create = self.client.chat.completions.create
+        self.discord_webhook = DiscordWebhook(http_client=http_client)
+        self.model = "gpt-4o-mini"
+        self.last_signals: Dict[str, float] = {}  # symbol -> time.monotonic()
         self.min_signal_interval = 3600  # Minimum 1 hour between signals for same symbol
+        self.temperature = 0.3
+        # Signals are already rate limited per symbol, so cached analyses must
+        # outlive that interval to ever be reused
+        self.response_cache = ResponseCache(ttl=3 * self.min_signal_interval)
+        # Trading signals for different symbols are handled concurrently by
+        # the event queue; bound how many completion requests are in flight
+        self._openai_semaphore = asyncio.Semaphore(5)
+        self.last_good_analysis: Dict[str, Dict[str, Any]] = {}
         
     async def start(self):
         """Start generating signals"""
         # Register event handler
         self.event_queue.register_handler("trading_signal", self._handle_trading_signal)
         
+    async def stop(self):
+        """Stop generating signals"""
+        # A shared HTTP client is owned (and closed) by the caller; this only
+        # closes the webhook's own client when none was shared
+        await self.discord_webhook.aclose()
+        logger.info("Signal generator stopped")
+        
     async def _handle_trading_signal(self, event: Event):
         """Handle trading signal events"""
         try:
@@ -37,10 +169,8 @@ class SignalGenerator:
             sentiment_data = event.data["sentiment_data"]
             
             # Check if we've sent a signal recently
-            if symbol in self.last_signals:
-                time_since_last = (datetime.now() - self.last_signals[symbol]).total_seconds()
-                if time_since_last < self.min_signal_interval:
-                    return
+            if time.monotonic() - self.last_signals.get(symbol, float('-inf')) < self.min_signal_interval:
+                return
                     
             # Generate signal using OpenAI
             signal = await self._generate_signal(symbol, technical_data, sentiment_data)
@@ -50,7 +180,7 @@ class SignalGenerator:
                 await self._send_discord_notification(symbol, signal)
                 
                 # Update last signal time
-                self.last_signals[symbol] = datetime.now()
+                self.last_signals[symbol] = time.monotonic()
                 
         except Exception as e:
             logger.error(f"Error handling trading signal: {e}")
@@ -58,41 +188,52 @@ class SignalGenerator:
     async def _generate_signal(self, symbol: str, technical_data: Dict[str, Any], sentiment_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Generate a trading signal using OpenAI"""
         try:
-            # Format the data into a clear prompt
-            prompt = (
-                f"Analyze {symbol} for options swing trading using the box method. Provide specific entry/exit points and a brief analysis.\n\n"
-                f"Technical Data:\n"
-                f"RSI: {technical_data.get('rsi', 'N/A')} (Relative Strength Index - measures overbought/oversold conditions)\n"
-                f"MACD: {technical_data.get('macd', 'N/A')} (Moving Average Convergence Divergence - trend momentum)\n"
-                f"Bollinger Bands: {technical_data.get('bollinger_bands', {}).get('upper', 'N/A')} | {technical_data.get('bollinger_bands', {}).get('middle', 'N/A')} | {technical_data.get('bollinger_bands', {}).get('lower', 'N/A')} (Price volatility bands)\n"
-                f"Sentiment: {sentiment_data.get('sentiment_label', 'N/A')} ({sentiment_data.get('overall_score', 'N/A')})\n\n"
-                f"Provide:\n"
-                f"1. Clear entry/exit points using the box method\n"
-                f"2. Brief technical analysis (max 2 sentences)\n"
-                f"3. Beginner-friendly explanation (2-3 sentences):\n"
-                f"   - Explain what the analysis means in simple terms\n"
-                f"   - Avoid technical jargon\n"
-                f"   - Use analogies if helpful (e.g., 'like a rubber band stretching')\n"
-                f"   - Explain why we're choosing calls or puts\n"
-                f"4. Confidence level (High/Medium/Low) with a simple reason why\n"
-                f"5. Key price levels to watch\n"
-                f"Format as JSON with keys: entry_points, exit_points, analysis, simplified_analysis, confidence, confidence_reason, key_levels"
+            cache_key = ResponseCache.make_key(symbol, technical_data, sentiment_data)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Reusing cached analysis for {symbol}")
+                return cached
+                
+            # Only the per-symbol data varies between requests
+            bollinger = technical_data.get('bollinger_bands', {})
+            data_message = _PROMPT_TEMPLATE.format(
+                symbol=symbol,
+                rsi=technical_data.get('rsi', 'N/A'),
+                macd=technical_data.get('macd', 'N/A'),
+                bb_upper=bollinger.get('upper', 'N/A'),
+                bb_middle=bollinger.get('middle', 'N/A'),
+                bb_lower=bollinger.get('lower', 'N/A'),
+                sentiment_label=sentiment_data.get('sentiment_label', 'N/A'),
+                sentiment_score=sentiment_data.get('overall_score', 'N/A')
             )
             
-            # Get AI analysis
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert options trader explaining complex concepts to complete beginners. Use simple language, analogies, and clear explanations that anyone can understand. Avoid technical jargon, and when you must use it, explain what it means in plain English."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=400,
-                temperature=0.3
-            )
+            messages = [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": STATIC_INSTRUCTIONS},
+                {"role": "user", "content": data_message}
+            ]
             
-            # Parse the response
-            analysis_str = response.choices[0].message.content
-            analysis = json.loads(analysis_str)
+            # Get AI analysis; retry once deterministically if the JSON is
+            # malformed, then fall back to the last good analysis for the symbol
+            try:
+                analysis = await self._request_analysis(messages, self.temperature)
+            except orjson.JSONDecodeError:
+                logger.warning(f"Malformed analysis JSON for {symbol}, retrying at temperature 0")
+                try:
+                    analysis = await self._request_analysis(messages, 0)
+                except orjson.JSONDecodeError:
+                    fallback = self.last_good_analysis.get(symbol)
+                    if fallback is not None:
+                        logger.warning(f"Using last good analysis for {symbol}")
+                    else:
+                        logger.error(f"Could not parse analysis for {symbol}")
+                    return fallback
+            
+            self.last_good_analysis[symbol] = analysis
+            
+            # High-temperature output is not stable enough to reuse
+            if self.temperature <= 0.5:
+                self.response_cache.set(cache_key, analysis)
             
             return analysis
             
@@ -100,6 +241,18 @@ class SignalGenerator:
             logger.error(f"Error generating signal: {e}")
             return None
             
+    async def _request_analysis(self, messages: list, temperature: float) -> Dict[str, Any]:
+        """Request a schema-constrained analysis and decode it with orjson"""
+        async with self._openai_semaphore:
+            response = await self._create(
+                model=self.model,
+                messages=messages,
+                response_format=SIGNAL_RESPONSE_FORMAT,
+                max_tokens=250,
+                temperature=temperature
+            )
+        return orjson.loads(response.choices[0].message.content)
+            
     async def _send_discord_notification(self, symbol: str, signal: Dict[str, Any]):
         """Send a Discord notification for the trading signal"""
         try:
@@ -110,11 +263,7 @@ class SignalGenerator:
             option_type = "call" if signal.get("analysis", "").lower().find("bullish") != -1 else "put"
             
             # Get expiration date (next Friday)
-            today = datetime.now()
-            days_ahead = 4 - today.weekday()  # 4 is Friday
-            if days_ahead <= 0:  # If today is Friday or later in the week
-                days_ahead += 7
-            expiration_date = (today + timedelta(days=days_ahead)).strftime('%m-%d-%y')
+            expiration_date = _weekly_expiration(date.today())
             
             # Calculate premium (simplified)
             premium = current_price * 0.02  # 2% of current price
@@ -126,7 +275,7 @@ class SignalGenerator:
                 option_type=option_type,
                 expiration_date=expiration_date,
                 premium=premium,
-                ai_analysis=json.dumps(signal)
+                ai_analysis=orjson.dumps(signal).decode()
             )
             
         except Exception as e:
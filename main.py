@@ -1,7 +1,10 @@
 import asyncio
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from typing import List
+import httpx
 from dotenv import load_dotenv
 
 from events.event_queue import EventQueue
@@ -9,33 +12,39 @@ from monitors.price_monitor import PriceMonitor
 from monitors.news_monitor import NewsMonitor
 from processors.event_processor import EventProcessor
 from generators.signal_generator import SignalGenerator
+from analysis.sentiment.finbert_analyzer import FinBERTAnalyzer
+from analysis.technical.technical_analysis import TechnicalAnalyzer
+from utils.helpers import install_uvloop
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging: records are queued by the caller and formatted/written
+# on the listener's background thread, keeping console I/O off the event loop
+_log_queue = queue.SimpleQueue()
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+log_listener = QueueListener(_log_queue, _console_handler)
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(QueueHandler(_log_queue))
+log_listener.start()
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()  # Load environment variables from .env file
 
-# Debug log environment variables (masking sensitive values)
-logger.info("Environment variables loaded:")
-logger.info(f"ALPACA_API_KEY: {'*' * len(os.getenv('ALPACA_API_KEY', ''))}")
-logger.info(f"ALPACA_API_SECRET: {'*' * len(os.getenv('ALPACA_API_SECRET', ''))}")
-logger.info(f"OPENAI_API_KEY: {'*' * len(os.getenv('OPENAI_API_KEY', ''))}")
-logger.info(f"DISCORD_WEBHOOK_URL: {'*' * len(os.getenv('DISCORD_WEBHOOK_URL', ''))}")
-logger.info(f"NEWS_API_KEY: {'*' * len(os.getenv('NEWS_API_KEY', ''))}")
-logger.info(f"AWS_ACCESS_KEY_ID: {'*' * len(os.getenv('AWS_ACCESS_KEY_ID', ''))}")
-logger.info(f"AWS_SECRET_ACCESS_KEY: {'*' * len(os.getenv('AWS_SECRET_ACCESS_KEY', ''))}")
-logger.info(f"AWS_REGION: {os.getenv('AWS_REGION', 'not set')}")
+# Log which secrets are configured, never their values or lengths
+logger.info("Environment loaded: %s",
+            sorted(k for k in os.environ if k.endswith(('_KEY', '_SECRET', '_URL', '_KEY_ID'))))
 
 # Configuration
 TRADING_SYMBOLS = ['AAPL', 'MSFT', 'GOOGL']
 
 async def main():
     """Initialize and run the trading system"""
+    # One pooled keep-alive client shared by OpenAI and Discord traffic
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=30.0,
+        http2=True
+    )
     try:
         # Initialize components
         event_queue = EventQueue()
@@ -44,11 +53,19 @@ async def main():
             api_secret=os.getenv('ALPACA_API_SECRET'),
             event_queue=event_queue
         )
-        news_monitor = NewsMonitor(event_queue)
-        event_processor = EventProcessor(event_queue)
+        # Analyzers are built once and shared by the components that use them
+        sentiment_analyzer = FinBERTAnalyzer()
+        technical_analyzer = TechnicalAnalyzer()
+        news_monitor = NewsMonitor(event_queue, analyzer=sentiment_analyzer)
+        event_processor = EventProcessor(
+            event_queue,
+            technical_analyzer=technical_analyzer,
+            sentiment_analyzer=sentiment_analyzer
+        )
         signal_generator = SignalGenerator(
             event_queue=event_queue,
-            openai_api_key=os.getenv('OPENAI_API_KEY')
+            openai_api_key=os.getenv('OPENAI_API_KEY'),
+            http_client=http_client
         )
         
         # Start components in order
@@ -71,9 +88,15 @@ async def main():
         await news_monitor.stop()
         await event_processor.stop()
         await signal_generator.stop()
+        await http_client.aclose()
 
 if __name__ == "__main__":
+    # uvloop is a faster drop-in event loop for the websocket and HTTP traffic
+    # here; on Windows the default loop is used
+    install_uvloop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Shutting down...")
+    finally:
+        log_listener.stop()
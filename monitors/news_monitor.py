@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
 from analysis.sentiment.finbert_analyzer import FinBERTAnalyzer
@@ -11,12 +11,14 @@ logger = logging.getLogger(__name__)
 class NewsMonitor:
     """Monitors news and publishes sentiment events 24/7"""
     
-    def __init__(self, event_queue: EventQueue):
+    def __init__(self, event_queue: EventQueue, analyzer: Optional[FinBERTAnalyzer] = None):
         self.event_queue = event_queue
-        self.analyzer = FinBERTAnalyzer()
+        self.analyzer = analyzer or FinBERTAnalyzer()
         self.checked_articles: Dict[str, set] = {}
         self.running = False
         self.last_check: Dict[str, datetime] = {}
+        # Bound concurrent symbol lookups against the news API rate limit
+        self._fetch_semaphore = asyncio.Semaphore(8)
         
     async def start(self, symbols: List[str]):
         """Start monitoring news for given symbols"""
@@ -36,27 +38,33 @@ class NewsMonitor:
         """Continuously monitor news for symbols"""
         while self.running:
             try:
-                for symbol in symbols:
-                    try:
-                        # Get sentiment for the symbol
-                        sentiment = self.analyzer.get_ticker_sentiment(symbol)
-                        
-                        # Publish sentiment event
-                        await self.event_queue.publish_news_update(
-                            symbol=symbol,
-                            article={"sentiment": sentiment}
-                        )
-                        
-                        self.last_check[symbol] = datetime.now()
-                        logger.info(f"Updated news sentiment for {symbol}: {sentiment['overall_score']:.2f}")
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing news for {symbol}: {e}")
-                        continue  # Continue with next symbol even if one fails
+                # Fetch all symbols concurrently; failures are handled per symbol
+                await asyncio.gather(*(self._fetch_one(symbol) for symbol in symbols),
+                                     return_exceptions=True)
                     
                 # Wait before next check
                 await asyncio.sleep(60)  # Check every minute
                 
             except Exception as e:
                 logger.error(f"Error in news monitoring loop: {e}")
-                await asyncio.sleep(60)  # Wait before retrying 
\ No newline at end of file
+                await asyncio.sleep(60)  # Wait before retrying
+                
+    async def _fetch_one(self, symbol: str):
+        """Fetch sentiment for one symbol and publish it"""
+        try:
+            async with self._fetch_semaphore:
+                # get_ticker_sentiment does blocking HTTP and scoring, so keep
+                # it off the event loop
+                sentiment = await asyncio.to_thread(self.analyzer.get_ticker_sentiment, symbol)
+            
+            # Publish sentiment event
+            await self.event_queue.publish_news_update(
+                symbol=symbol,
+                article={"sentiment": sentiment}
+            )
+            
+            self.last_check[symbol] = datetime.now()
+            logger.info(f"Updated news sentiment for {symbol}: {sentiment['overall_score']:.2f}")
+            
+        except Exception as e:
+            logger.error(f"Error processing news for {symbol}: {e}")
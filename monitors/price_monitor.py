@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -14,6 +15,8 @@ logger = logging.getLogger(__name__)
 class PriceMonitor:
     """Monitors price changes and publishes events"""
     
+    QUOTE_SUMMARY_INTERVAL = 5.0  # seconds
+    
     def __init__(self, api_key: str, api_secret: str, event_queue: EventQueue):
         self.api_key = api_key
         self.api_secret = api_secret
@@ -23,6 +26,12 @@ class PriceMonitor:
         self.last_prices: Dict[str, float] = {}
         self.running = False
         self._stream_task = None
+        # True when the stream runs as a coroutine on this loop (private
+        # alpaca-py API); False when it runs via the public run() on a thread
+        self._stream_on_loop = True
+        # Per-symbol quote counts, summarized at INFO every QUOTE_SUMMARY_INTERVAL
+        self._quote_counts: Dict[str, int] = {}
+        self._last_quote_summary = time.monotonic()
         
     async def start(self, symbols: list[str]):
         """Start monitoring prices for given symbols"""
@@ -32,6 +41,13 @@ class PriceMonitor:
             
             # Initialize clients
             self.stream = StockDataStream(self.api_key, self.api_secret)
+            # _run_forever()/stop_ws() are private alpaca-py API, used because
+            # the public run() wraps asyncio.run() and cannot be awaited from a
+            # running loop. If a release drops them, fall back to run() on a
+            # worker thread rather than failing to stream at all.
+            self._stream_on_loop = hasattr(self.stream, '_run_forever') and hasattr(self.stream, 'stop_ws')
+            if not self._stream_on_loop:
+                logger.warning("alpaca-py stream internals changed; running the stream on a worker thread")
             self.hist_client = StockHistoricalDataClient(self.api_key, self.api_secret)
             logger.info("Initialized Alpaca clients")
             
@@ -40,7 +56,8 @@ class PriceMonitor:
             logger.info(f"Got initial prices: {self.last_prices}")
             
             # Subscribe to price updates
-            self.stream.subscribe_quotes(self._handle_price_update, *symbols)
+            handler = self._handle_price_update if self._stream_on_loop else self._threaded_quote_handler()
+            self.stream.subscribe_quotes(handler, *symbols)
             logger.info(f"Subscribed to price updates for {symbols}")
             
             # Start the stream in a separate task
@@ -58,55 +75,59 @@ class PriceMonitor:
         self.running = False
         if self.stream:
             try:
-                if self._stream_task:
-                    logger.info("Stopping price stream...")
-                    self.stream.stop()
-                    try:
-                        await asyncio.wait_for(self._stream_task, timeout=5.0)
-                        logger.info("Price stream stopped successfully")
-                    except asyncio.TimeoutError:
-                        logger.warning("Timeout waiting for stream task to complete")
-                    except Exception as e:
-                        logger.error(f"Error waiting for stream task: {e}")
+                if self._stream_on_loop:
+                    # stop() blocks on the stream's own loop, which is this one;
+                    # the coroutine form signals the websocket loop directly
+                    await self.stream.stop_ws()
+                else:
+                    # Thread fallback: the public stop() signals the stream's loop
+                    await asyncio.to_thread(self.stream.stop)
             except Exception as e:
                 logger.error(f"Error stopping stream: {e}")
+        if self._stream_task:
+            logger.info("Stopping price stream...")
+            self._stream_task.cancel()
+            try:
+                await asyncio.wait_for(self._stream_task, timeout=5.0)
+            except asyncio.CancelledError:
+                pass
+            except asyncio.TimeoutError:
+                logger.warning("Timeout waiting for stream task to complete")
+            except Exception as e:
+                logger.error(f"Error waiting for stream task: {e}")
+            self._stream_task = None
         logger.info("Price monitor stopped")
         
     async def _run_stream(self):
-        """Run the stream in a separate task"""
-        try:
-            logger.info("Starting price stream...")
-            while self.running:
-                try:
-                    if self.stream:
-                        # Run the stream in a separate task to avoid blocking
-                        logger.info("Connecting to Alpaca websocket stream...")
-                        stream_task = asyncio.create_task(self.stream.run())
-                        try:
-                            await stream_task
-                            logger.info("Stream task completed")
-                        except asyncio.CancelledError:
-                            logger.info("Stream task cancelled")
-                            break
-                        except Exception as e:
-                            logger.error(f"Error in stream task: {e}")
-                            if self.running:
-                                logger.info("Retrying stream in 5 seconds...")
-                                await asyncio.sleep(5)  # Wait before retrying
-                                continue
-                    else:
-                        logger.error("Stream is None, stopping")
-                        self.running = False
-                        break
-                except Exception as e:
-                    logger.error(f"Error in stream: {e}")
-                    if self.running:
-                        logger.info("Retrying stream in 5 seconds...")
-                        await asyncio.sleep(5)  # Wait before retrying
-                        continue
-        except Exception as e:
-            logger.error(f"Fatal error in stream: {e}")
-            self.running = False
+        """Run the websocket stream on this event loop, reconnecting on errors"""
+        logger.info("Starting price stream...")
+        # stream.run() wraps asyncio.run() and cannot be awaited from a running
+        # loop, so drive the stream's coroutine directly
+        while self.running:
+            try:
+                logger.info("Connecting to Alpaca websocket stream...")
+                if self._stream_on_loop:
+                    await self.stream._run_forever()
+                else:
+                    await asyncio.get_running_loop().run_in_executor(None, self.stream.run)
+                logger.info("Price stream ended")
+            except asyncio.CancelledError:
+                logger.info("Price stream cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Error in stream: {e}")
+                if self.running:
+                    logger.info("Retrying stream in 5 seconds...")
+                    await asyncio.sleep(5)  # Wait before retrying
+        
+    def _threaded_quote_handler(self):
+        """Quote handler for the thread fallback: hands each quote back to this loop"""
+        loop = asyncio.get_running_loop()
+        
+        async def forward(quote):
+            asyncio.run_coroutine_threadsafe(self._handle_price_update(quote), loop)
+        
+        return forward
         
     async def _get_initial_prices(self, symbols: list[str]):
         """Get initial prices for symbols"""
@@ -133,15 +154,18 @@ class PriceMonitor:
             symbol = quote.symbol
             current_price = float(quote.ask_price)
             volume = int(quote.ask_size)
+            debug = logger.isEnabledFor(logging.DEBUG)
             
-            logger.info(f"Received price update for {symbol}: ${current_price:.2f} (Volume: {volume:,})")
+            if debug:
+                logger.debug("Received price update for %s: $%.2f (Volume: %d)", symbol, current_price, volume)
             
             # Calculate price change
             if symbol in self.last_prices:
                 last_price = self.last_prices[symbol]
                 price_change = (current_price - last_price) / last_price
                 
-                logger.info(f"Price change for {symbol}: {price_change:.2%}")
+                if debug:
+                    logger.debug("Price change for %s: %.2f%%", symbol, price_change * 100)
                 
                 # Publish price update event
                 await self.event_queue.publish_price_update(
@@ -150,10 +174,21 @@ class PriceMonitor:
                     volume=volume,
                     change=price_change
                 )
-                logger.info(f"Published price update event for {symbol}")
                 
             # Update last price
             self.last_prices[symbol] = current_price
+            self._record_quote(symbol)
             
         except Exception as e:
-            logger.error(f"Error handling price update: {e}") 
\ No newline at end of file
+            logger.error(f"Error handling price update: {e}")
+            
+    def _record_quote(self, symbol: str):
+        """Count a quote and periodically log a per-symbol summary at INFO"""
+        self._quote_counts[symbol] = self._quote_counts.get(symbol, 0) + 1
+        now = time.monotonic()
+        elapsed = now - self._last_quote_summary
+        if elapsed >= self.QUOTE_SUMMARY_INTERVAL:
+            logger.info("Processed quotes in last %.0fs: %s", elapsed,
+                        ", ".join(f"{sym}={count}" for sym, count in self._quote_counts.items()))
+            self._quote_counts.clear()
+            self._last_quote_summary = now
@@ -1,7 +1,22 @@
 import asyncio
+import contextlib
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional, Tuple
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the predicates run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
 
 from analysis.technical.technical_analysis import TechnicalAnalyzer
 from analysis.sentiment.finbert_analyzer import FinBERTAnalyzer
@@ -9,48 +24,191 @@ from events.event_queue import EventQueue, Event, EventPriority
 
 logger = logging.getLogger(__name__)
 
+@njit(cache=True)
+def _tech_signal(rsi, macd, has_bb, upper, middle, lower, price):
+    """RSI extremes, strong MACD momentum or price within 10% of a Bollinger band"""
+    if rsi < 30.0 or rsi > 70.0:  # Overbought/oversold
+        return True
+    if abs(macd) > 2.0:  # Strong momentum
+        return True
+    if has_bb:
+        if abs(price - upper) < (upper - middle) * 0.1 or \
+           abs(price - lower) < (middle - lower) * 0.1:
+            return True
+    return False
+
+@njit(cache=True)
+def _sentiment_change(values):
+    """Mean absolute change between consecutive readings exceeds the threshold"""
+    return np.abs(np.diff(values)).mean() > 0.2
+
+@lru_cache(maxsize=1)
+def _iso_second(epoch_seconds: int) -> str:
+    return datetime.fromtimestamp(epoch_seconds, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+def _iso_utc(epoch_ns: int) -> str:
+    """UTC ISO-8601 timestamp with microseconds; the per-second prefix is cached"""
+    seconds, nanos = divmod(epoch_ns, 1_000_000_000)
+    return f"{_iso_second(seconds)}.{nanos // 1000:06d}+00:00"
+
+# Shared default for missing Bollinger bands; never mutated
+_EMPTY_BB = {"upper": 0, "middle": 0, "lower": 0}
+
+def _warm_up_predicates():
+    """Compile (or load from the numba cache) the predicates before the first event"""
+    _tech_signal(50.0, 0.0, False, 0.0, 0.0, 0.0, 0.0)
+    _sentiment_change(np.zeros(2, dtype=np.float32))
+
+class _RingBuffer:
+    """Fixed-size float32 history with O(1) appends and an O(1) running mean"""
+    
+    __slots__ = ('_buf', '_idx', '_sum')
+    
+    def __init__(self, size: int):
+        self._buf = np.empty(size, dtype=np.float32)
+        self._idx = 0  # total values written
+        self._sum = 0.0  # sum of the stored values
+        
+    def append(self, value: float):
+        slot = self._idx % self._buf.size
+        if self._idx >= self._buf.size:
+            self._sum -= float(self._buf[slot])  # evicted value
+        self._buf[slot] = value
+        # Accumulate the stored (float32-rounded) value so evictions cancel exactly
+        self._sum += float(self._buf[slot])
+        self._idx += 1
+        
+    def __len__(self) -> int:
+        return min(self._idx, self._buf.size)
+        
+    def mean(self) -> float:
+        return self._sum / len(self) if self._idx else 0.0
+        
+    def ordered(self) -> np.ndarray:
+        """Stored values, oldest first"""
+        if self._idx <= self._buf.size:
+            return self._buf[:self._idx]
+        start = self._idx % self._buf.size
+        return np.concatenate((self._buf[start:], self._buf[:start]))
+
+class _SymbolHistories(OrderedDict):
+    """Per-symbol ring buffers, evicting the least recently updated symbol past max_symbols"""
+    
+    def __init__(self, max_symbols: int, max_history: int,
+                 on_evict: Optional[Callable[[str], None]] = None):
+        super().__init__()
+        self.max_symbols = max_symbols
+        self.max_history = max_history
+        self.on_evict = on_evict  # called with each evicted symbol
+        
+    def touch(self, symbol: str) -> _RingBuffer:
+        """Buffer for a symbol (created if new), marked most recently used"""
+        history = self.get(symbol)
+        if history is None:
+            history = self[symbol] = _RingBuffer(self.max_history)
+            if len(self) > self.max_symbols:
+                evicted, _ = self.popitem(last=False)
+                if self.on_evict is not None:
+                    self.on_evict(evicted)
+        else:
+            self.move_to_end(symbol)
+        return history
+
 class EventProcessor:
     """Processes events and generates trading signals"""
     
-    def __init__(self, event_queue: EventQueue):
+    TECHNICAL_CACHE_TTL = 60.0  # seconds
+    SIGNAL_COOLDOWN = 300.0  # seconds before an unchanged technical signal is re-evaluated
+    PRICE_FLUSH_INTERVAL = 0.1  # seconds; ticks within a window are evaluated once per symbol
+    
+    def __init__(self, event_queue: EventQueue,
+                 technical_analyzer: Optional[TechnicalAnalyzer] = None,
+                 sentiment_analyzer: Optional[FinBERTAnalyzer] = None):
         self.event_queue = event_queue
-        self.technical_analyzer = TechnicalAnalyzer()
-        self.sentiment_analyzer = FinBERTAnalyzer()
-        self.price_history: Dict[str, list[float]] = {}
-        self.sentiment_history: Dict[str, list[float]] = {}
+        # Analyzers may be shared with other components; build them only if not supplied
+        self.technical_analyzer = technical_analyzer or TechnicalAnalyzer()
+        self.sentiment_analyzer = sentiment_analyzer or FinBERTAnalyzer()
         self.max_history = 100  # Keep last 100 data points
+        self.max_symbols = 256  # News can surface arbitrary tickers; keep the most recent
+        # The per-symbol dicts below are pruned as symbols fall out of both histories
+        self.price_history = _SymbolHistories(self.max_symbols, self.max_history, self._forget_symbol)
+        self.sentiment_history = _SymbolHistories(self.max_symbols, self.max_history, self._forget_symbol)
+        # symbol -> (time.monotonic() when computed, technical analysis)
+        self._ta_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # symbol -> (time.monotonic() when last evaluated, signal fingerprint)
+        self._last_signal: Dict[str, Tuple[float, tuple]] = {}
+        # Symbols with ticks since the last flush -> latest price
+        self._latest_price: Dict[str, float] = {}
+        self._flush_task: Optional[asyncio.Task] = None
         self.running = False
         
+    def _forget_symbol(self, symbol: str):
+        """Drop a symbol's cached state once neither history tracks it"""
+        if symbol in self.price_history or symbol in self.sentiment_history:
+            return
+        self._ta_cache.pop(symbol, None)
+        self._last_signal.pop(symbol, None)
+        self._latest_price.pop(symbol, None)
+        
     async def start(self):
         """Start processing events"""
+        # JIT compilation takes seconds on a cold cache; keep it off the loop
+        await asyncio.to_thread(_warm_up_predicates)
         self.running = True
         # Register event handlers
         self.event_queue.register_handler("price_update", self._handle_price_update)
         self.event_queue.register_handler("news_update", self._handle_news_update)
+        self._flush_task = asyncio.create_task(self._flush_loop())
         
     async def stop(self):
         """Stop processing events"""
         self.running = False
+        if self._flush_task:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
         logger.info("Stopping event processor")
         
     async def _handle_price_update(self, event: Event):
-        """Handle price update events"""
+        """Record a price tick; signal evaluation is coalesced in _flush_loop"""
         try:
             symbol = event.data["symbol"]
             price = event.data["price"]
             
             # Update price history
-            if symbol not in self.price_history:
-                self.price_history[symbol] = []
-            self.price_history[symbol].append(price)
-            if len(self.price_history[symbol]) > self.max_history:
-                self.price_history[symbol].pop(0)
+            self.price_history.touch(symbol).append(price)
+            self._latest_price[symbol] = price
                 
+        except Exception as e:
+            logger.error("Error handling price update: %s", e)
+            
+    async def _flush_loop(self):
+        """Evaluate each symbol that ticked once per PRICE_FLUSH_INTERVAL"""
+        while self.running:
+            await asyncio.sleep(self.PRICE_FLUSH_INTERVAL)
+            if not self._latest_price:
+                continue
+            pending, self._latest_price = self._latest_price, {}
+            for symbol in pending:
+                await self._evaluate_price_signal(symbol)
+                
+    async def _evaluate_price_signal(self, symbol: str):
+        """Run the technical/sentiment pipeline for a symbol's latest price"""
+        try:
             # Get technical analysis
-            technical_data = self.technical_analyzer.analyze(symbol)
+            technical_data = self._analyze_cached(symbol)
             
             # Check for significant technical signals
             if self._has_significant_technical_signal(technical_data):
+                # Skip the sentiment lookup while the same signal is still cooling down
+                fingerprint = self._signal_fingerprint(technical_data)
+                now = time.monotonic()
+                last = self._last_signal.get(symbol)
+                if last is not None and last[1] == fingerprint and now - last[0] < self.SIGNAL_COOLDOWN:
+                    return
+                self._last_signal[symbol] = (now, fingerprint)
+                
                 # Get sentiment analysis
                 sentiment_data = self.sentiment_analyzer.get_ticker_sentiment(symbol)
                 
@@ -58,7 +216,7 @@ class EventProcessor:
                 await self._generate_trading_signal(symbol, technical_data, sentiment_data)
                 
         except Exception as e:
-            logger.error(f"Error handling price update: {e}")
+            logger.error("Error evaluating price signal for %s: %s", symbol, e)
             
     async def _handle_news_update(self, event: Event):
         """Handle news update events"""
@@ -66,76 +224,85 @@ class EventProcessor:
             symbol = event.data["symbol"]
             article = event.data["article"]
             sentiment = article["sentiment"]
+            # NewsMonitor publishes the full sentiment dict; history tracks the score
+            if isinstance(sentiment, dict):
+                sentiment = sentiment.get("overall_score", 0.0)
             
             # Update sentiment history
-            if symbol not in self.sentiment_history:
-                self.sentiment_history[symbol] = []
-            self.sentiment_history[symbol].append(sentiment)
-            if len(self.sentiment_history[symbol]) > self.max_history:
-                self.sentiment_history[symbol].pop(0)
+            history = self.sentiment_history.touch(symbol)
+            history.append(sentiment)
                 
             # Check for significant sentiment change
             if self._has_significant_sentiment_change(symbol):
                 # Get technical analysis
-                technical_data = self.technical_analyzer.analyze(symbol)
+                technical_data = self._analyze_cached(symbol)
                 
                 # Generate trading signal
+                mean_score = history.mean()
                 await self._generate_trading_signal(symbol, technical_data, {
-                    "overall_score": sum(self.sentiment_history[symbol]) / len(self.sentiment_history[symbol]),
-                    "sentiment_label": "positive" if sum(self.sentiment_history[symbol]) > 0 else "negative"
+                    "overall_score": mean_score,
+                    "sentiment_label": "positive" if mean_score > 0 else "negative"
                 })
                 
         except Exception as e:
-            logger.error(f"Error handling news update: {e}")
+            logger.error("Error handling news update: %s", e)
             
+    def _analyze_cached(self, symbol: str) -> Dict[str, Any]:
+        """Technical analysis for a symbol, recomputed at most once per TECHNICAL_CACHE_TTL"""
+        now = time.monotonic()
+        hit = self._ta_cache.get(symbol)
+        if hit is not None and now - hit[0] < self.TECHNICAL_CACHE_TTL:
+            return hit[1]
+        data = self.technical_analyzer.analyze(symbol)
+        if data:  # don't pin a failed lookup for the whole TTL
+            self._ta_cache[symbol] = (now, data)
+        return data
+        
+    @staticmethod
+    def _signal_fingerprint(technical_data: Dict[str, Any]) -> tuple:
+        """Coarse summary of a technical signal: RSI band, rounded MACD, Bollinger zone"""
+        bb = technical_data.get("bollinger_bands") or {}
+        price = technical_data.get("current_price", 0)
+        zone = int(price > bb.get("upper", price)) - int(price < bb.get("lower", price))
+        # NaN/inf readings (e.g. too little history) get a None bucket: round()
+        # raises on them, and NaN would never compare equal to the last fingerprint
+        rsi = technical_data.get("rsi", 50)
+        macd = technical_data.get("macd", 0)
+        return (rsi // 5 if math.isfinite(rsi) else None,
+                round(macd) if math.isfinite(macd) else None,
+                zone)
+        
     def _has_significant_technical_signal(self, technical_data: Dict[str, Any]) -> bool:
         """Check if technical data shows significant signals"""
         try:
-            # Check RSI
-            rsi = technical_data.get("rsi", 50)
-            if rsi < 30 or rsi > 70:  # Overbought/oversold
-                return True
-                
-            # Check MACD
-            macd = technical_data.get("macd", 0)
-            if abs(macd) > 2:  # Strong momentum
-                return True
-                
-            # Check Bollinger Bands
-            bb = technical_data.get("bollinger_bands", {})
-            if bb:
-                upper = bb.get("upper", 0)
-                lower = bb.get("lower", 0)
-                middle = bb.get("middle", 0)
-                current_price = technical_data.get("current_price", 0)
-                
-                if abs(current_price - upper) < (upper - middle) * 0.1 or \
-                   abs(current_price - lower) < (middle - lower) * 0.1:
-                    return True
-                    
-            return False
+            # Unpack in Python once; the numeric check takes plain floats
+            get = technical_data.get
+            bb = get("bollinger_bands") or _EMPTY_BB
+            return bool(_tech_signal(
+                float(get("rsi", 50)),
+                float(get("macd", 0)),
+                bb is not _EMPTY_BB,
+                float(bb.get("upper", 0)),
+                float(bb.get("middle", 0)),
+                float(bb.get("lower", 0)),
+                float(get("current_price", 0))
+            ))
             
         except Exception as e:
-            logger.error(f"Error checking technical signals: {e}")
+            logger.error("Error checking technical signals: %s", e)
             return False
             
     def _has_significant_sentiment_change(self, symbol: str) -> bool:
         """Check if sentiment has changed significantly"""
         try:
-            if symbol not in self.sentiment_history or len(self.sentiment_history[symbol]) < 2:
+            history = self.sentiment_history.get(symbol)
+            if history is None or len(history) < 2:
                 return False
                 
-            # Calculate average sentiment change
-            changes = []
-            for i in range(1, len(self.sentiment_history[symbol])):
-                change = abs(self.sentiment_history[symbol][i] - self.sentiment_history[symbol][i-1])
-                changes.append(change)
-                
-            avg_change = sum(changes) / len(changes)
-            return avg_change > 0.2  # Significant change threshold
+            return bool(_sentiment_change(history.ordered()))
             
         except Exception as e:
-            logger.error(f"Error checking sentiment change: {e}")
+            logger.error("Error checking sentiment change: %s", e)
             return False
             
     async def _generate_trading_signal(self, symbol: str, technical_data: Dict[str, Any], sentiment_data: Dict[str, Any]):
@@ -148,10 +315,9 @@ class EventProcessor:
                     "symbol": symbol,
                     "technical_data": technical_data,
                     "sentiment_data": sentiment_data,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _iso_utc(time.time_ns())
                 },
                 priority=EventPriority.HIGH,
-                timestamp=datetime.now(),
                 source="event_processor"
             )
             
@@ -159,4 +325,4 @@ class EventProcessor:
             await self.event_queue.publish(event)
             
         except Exception as e:
-            logger.error(f"Error generating trading signal: {e}") 
\ No newline at end of file
+            logger.error("Error generating trading signal: %s", e) 
\ No newline at end of file
@@ -3,7 +3,10 @@ import os
 import sys
 import asyncio
 from datetime import datetime, timedelta
+from typing import Optional
 import pytz
+import httpx
+import orjson
 from dotenv import load_dotenv
 
 from trading_agent import TradingAgent
@@ -12,40 +15,75 @@ from monitors.price_monitor import PriceMonitor
 from monitors.news_monitor import NewsMonitor
 from processors.event_processor import EventProcessor
 from generators.signal_generator import SignalGenerator
+from analysis.sentiment.finbert_analyzer import FinBERTAnalyzer
+from analysis.technical.technical_analysis import TechnicalAnalyzer
 from data.alpaca_connector import AlpacaConnector
+from utils.helpers import install_uvloop
 from config.config import (
     TRADING_SYMBOLS,
     MARKET_HOURS,
     CHECK_INTERVAL_MINUTES
 )
 
+# Attributes every LogRecord carries; anything else came in through extra=
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+class OrjsonFormatter(logging.Formatter):
+    """One JSON object per record; fields passed via extra= are included as keys"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "t": record.created,
+            "lvl": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/production.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+_log_formatter = OrjsonFormatter()
+_log_handlers = [logging.FileHandler('logs/production.log'), logging.StreamHandler(sys.stdout)]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+logging.basicConfig(level=logging.INFO, handlers=_log_handlers)
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+_ALPACA: Optional[AlpacaConnector] = None
+
+def _alpaca() -> AlpacaConnector:
+    """Shared connector for market clock checks, created on first use"""
+    global _ALPACA
+    if _ALPACA is None:
+        _ALPACA = AlpacaConnector()
+    return _ALPACA
+
 def is_market_open() -> bool:
     """Check if the market is currently open using Alpaca's API"""
     try:
-        alpaca = AlpacaConnector()
+        alpaca = _alpaca()
         is_open = alpaca.is_market_open()
-        logger.info(f"Market status from Alpaca: {'Open' if is_open else 'Closed'}")
+        logger.info("market status", extra={"open": is_open})
         return is_open
     except Exception as e:
-        logger.error(f"Error checking market status: {e}")
+        logger.error("Error checking market status: %s", e)
         return False
 
 async def run_production():
     """Run the trading agent in production mode"""
+    # One pooled keep-alive client shared by OpenAI and Discord traffic
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=30.0,
+        http2=True
+    )
     try:
         # Initialize components
         openai_api_key = os.getenv('OPENAI_API_KEY')
@@ -54,7 +92,6 @@ async def run_production():
             
         # Initialize event system
         event_queue = EventQueue()
-        logger.info("Initialized event queue")
         
         # Initialize monitors
         price_monitor = PriceMonitor(
@@ -62,81 +99,79 @@ async def run_production():
             api_secret=os.getenv('ALPACA_API_SECRET'),
             event_queue=event_queue
         )
-        logger.info("Initialized price monitor")
         
-        news_monitor = NewsMonitor(event_queue)
-        logger.info("Initialized news monitor")
+        # Analyzers are built once and shared by the components that use them
+        sentiment_analyzer = FinBERTAnalyzer()
+        technical_analyzer = TechnicalAnalyzer()
+        
+        news_monitor = NewsMonitor(event_queue, analyzer=sentiment_analyzer)
         
         # Initialize processors
-        event_processor = EventProcessor(event_queue)
-        logger.info("Initialized event processor")
+        event_processor = EventProcessor(
+            event_queue,
+            technical_analyzer=technical_analyzer,
+            sentiment_analyzer=sentiment_analyzer
+        )
         
-        signal_generator = SignalGenerator(event_queue, openai_api_key)
-        logger.info("Initialized signal generator")
+        signal_generator = SignalGenerator(event_queue, openai_api_key, http_client=http_client)
         
         # Initialize trading agent (this will send the production deployment message)
         agent = TradingAgent(event_queue)
-        logger.info("Initialized trading agent")
-        
-        logger.info("Starting production deployment...")
+        logger.info("initialized", extra={"component": "all"})
         
         # Start the agent first to send Discord message
         await agent.start()
-        logger.info("Trading agent started")
+        logger.info("started", extra={"component": "trading_agent"})
         
         # Start news monitoring immediately (24/7)
         await event_queue.start()
-        logger.info("Event queue started")
+        logger.info("started", extra={"component": "event_queue"})
         
         await news_monitor.start(TRADING_SYMBOLS)
-        logger.info("News monitor started")
+        logger.info("started", extra={"component": "news_monitor"})
         
         await event_processor.start()
-        logger.info("Event processor started")
+        logger.info("started", extra={"component": "event_processor"})
         
-        logger.info("Entering main loop...")
         while True:
             try:
                 # Check if market is open
-                logger.info("Checking market status...")
                 market_status = is_market_open()
-                logger.info(f"Market status: {'Open' if market_status else 'Closed'}")
                 
                 if market_status:
-                    logger.info("Market is open - starting price monitoring...")
-                    
                     # Start price monitoring only during market hours
-                    logger.info("Starting price monitor...")
                     await price_monitor.start(TRADING_SYMBOLS)
-                    logger.info("Price monitor started")
+                    logger.info("started", extra={"component": "price_monitor"})
                     
-                    logger.info("Starting signal generator...")
                     await signal_generator.start()
-                    logger.info("Signal generator started")
+                    logger.info("started", extra={"component": "signal_generator"})
                     
-                    # Keep running until market closes
-                    logger.info("Entering market hours loop...")
+                    # Sleep until the scheduled close, then confirm at a
+                    # relaxed interval in case the clock runs late
+                    market_hours = _alpaca().get_market_hours()
+                    if market_hours:
+                        wait_time = (market_hours['close'] - datetime.now(pytz.UTC)).total_seconds()
+                        logger.info("waiting for market close", extra={"close": market_hours['close'].isoformat()})
+                        await asyncio.sleep(max(wait_time, 0))
                     while is_market_open():
-                        await asyncio.sleep(1)
+                        await asyncio.sleep(60)
                     
                     # Stop only price-related components when market closes
-                    logger.info("Market closed - stopping price-related components...")
                     await signal_generator.stop()
                     await price_monitor.stop()
-                    logger.info("Price-related components stopped")
+                    logger.info("stopped", extra={"component": "price_monitor"})
                     
                 else:
                     # Get next market open time from Alpaca
-                    logger.info("Getting next market open time...")
-                    alpaca = AlpacaConnector()
-                    market_hours = alpaca.get_market_hours()
+                    market_hours = _alpaca().get_market_hours()
                     
                     if market_hours:
                         next_open = market_hours['open']
                         # Convert current time to UTC to match Alpaca's timezone
                         current_time = datetime.now(pytz.UTC)
                         wait_time = (next_open - current_time).total_seconds()
-                        logger.info(f"Market is closed. Waiting {wait_time/3600:.1f} hours until market opens at {next_open.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+                        logger.info("waiting for market open",
+                                    extra={"open": next_open.isoformat(), "wait_hours": round(wait_time / 3600, 1)})
                         
                         # Send Discord message about market hours sleep
                         agent.discord_webhook.send_update({
@@ -151,7 +186,7 @@ async def run_production():
                         await asyncio.sleep(60)  # Wait a minute before retrying
                 
             except Exception as e:
-                logger.error(f"Error in main loop: {e}")
+                logger.error("Error in main loop: %s", e)
                 # Send Discord message about error
                 agent.discord_webhook.send_update({
                     'type': 'error',
@@ -160,7 +195,7 @@ async def run_production():
                 await asyncio.sleep(60)  # Wait before retrying
                 
     except Exception as e:
-        logger.error(f"Fatal error in production deployment: {e}")
+        logger.error("Fatal error in production deployment: %s", e)
         # Send Discord message about fatal error
         agent.discord_webhook.send_update({
             'type': 'fatal_error',
@@ -172,10 +207,12 @@ async def run_production():
             await news_monitor.stop()
             await event_processor.stop()
             await event_queue.stop()
-            logger.info("All components stopped")
+            await http_client.aclose()
+            logger.info("stopped", extra={"component": "all"})
         except Exception as e:
-            logger.error(f"Error during shutdown: {e}")
+            logger.error("Error during shutdown: %s", e)
 
 if __name__ == "__main__":
     # Run the production script
+    install_uvloop()
     asyncio.run(run_production()) 
\ No newline at end of file
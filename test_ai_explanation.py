@@ -1,8 +1,11 @@
 import logging
 import json
+import os
+import sys
+import types
+from unittest import mock
 from analysis.explanation.ai_explainer import AIExplainer
 from analysis.technical.technical_analysis import TechnicalAnalyzer
-from analysis.sentiment.finbert_analyzer import FinBERTAnalyzer
 
 # Set up logging
 logging.basicConfig(
@@ -11,9 +14,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Fixed sentiment used unless RUN_FINBERT=1; this script exercises AIExplainer,
+# not the sentiment pipeline
+SENTIMENT_FIXTURE = {"overall_score": 0.12, "sentiment_label": "positive", "article_count": 5}
+
+def _get_sentiment(symbol: str) -> dict:
+    if os.getenv("RUN_FINBERT") == "1":
+        # Imported only on the opt-in path so the fixture run skips loading it
+        from analysis.sentiment.finbert_analyzer import FinBERTAnalyzer
+        return FinBERTAnalyzer().get_ticker_sentiment(symbol)
+    return dict(SENTIMENT_FIXTURE, ticker=symbol)
+
+def test_get_sentiment_runs_finbert_when_enabled():
+    """RUN_FINBERT=1 goes through FinBERTAnalyzer (stubbed here, so no model or network)"""
+    stub = types.ModuleType("analysis.sentiment.finbert_analyzer")
+    
+    class StubAnalyzer:
+        def get_ticker_sentiment(self, symbol):
+            return {"ticker": symbol, "overall_score": 0.5, "sentiment_label": "positive", "article_count": 2}
+    
+    stub.FinBERTAnalyzer = StubAnalyzer
+    with mock.patch.dict(os.environ, {"RUN_FINBERT": "1"}), \
+         mock.patch.dict(sys.modules, {stub.__name__: stub}):
+        assert _get_sentiment("SPY") == StubAnalyzer().get_ticker_sentiment("SPY")
+    
+    with mock.patch.dict(os.environ, {"RUN_FINBERT": "0"}):
+        assert _get_sentiment("SPY") == dict(SENTIMENT_FIXTURE, ticker="SPY")
+
 def test_trading_signals():
     # Get OpenAI API key from environment
-    import os
     from dotenv import load_dotenv
     load_dotenv()
     
@@ -23,7 +52,6 @@ def test_trading_signals():
     
     # Initialize analyzers
     technical_analyzer = TechnicalAnalyzer()
-    sentiment_analyzer = FinBERTAnalyzer()
     ai_explainer = AIExplainer(openai_api_key)
     
     # Test with SPY
@@ -41,7 +69,7 @@ def test_trading_signals():
     print(f"  - Lower: {technical_data.get('bollinger_bands', {}).get('lower', 'N/A')}")
     
     # Get sentiment analysis
-    sentiment_data = sentiment_analyzer.get_ticker_sentiment(symbol)
+    sentiment_data = _get_sentiment(symbol)
     print("\nSentiment Analysis Results:")
     print(f"Overall Score: {sentiment_data.get('overall_score', 'N/A')}")
     print(f"Sentiment Label: {sentiment_data.get('sentiment_label', 'N/A')}")
@@ -11,35 +11,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# BoxAnalyzer holds only configuration, so one instance serves every test
+BOX = BoxAnalyzer()
+
 def generate_box_pattern(base_price: float, box_size: float, num_candles: int = 20) -> tuple:
     """Generate a realistic box pattern with pre-box, box, and breakout phases"""
-    prices = []
-    volumes = []
-    timestamps = []
+    rng = np.random.default_rng()
     current_time = datetime.now()
     
-    # Pre-box phase (trending up to box)
-    for i in range(5):
-        trend = base_price * (1 + 0.001 * i)  # Slight uptrend
-        noise = np.random.normal(0, base_price * 0.001)  # 0.1% noise
-        prices.append(trend + noise)
-        volumes.append(np.random.uniform(8000, 10000))  # Normal volume
-        timestamps.append(current_time - timedelta(minutes=(num_candles-i)))
+    # Pre-box phase (trending up to box) with 0.1% noise and normal volume
+    pre_prices = base_price * (1 + 0.001 * np.arange(5)) + rng.normal(0, base_price * 0.001, 5)
+    pre_volumes = rng.uniform(8000, 10000, 5)
     
-    # Box phase (consolidation)
-    box_center = prices[-1]  # Last price of pre-box phase
+    # Box phase (consolidation around the last pre-box price) on lower volume
+    box_center = pre_prices[-1]
     box_half_range = box_size / 2
-    for i in range(10):
-        price = box_center + np.random.uniform(-box_half_range, box_half_range)
-        prices.append(price)
-        volumes.append(np.random.uniform(5000, 7000))  # Lower volume in consolidation
-        timestamps.append(current_time - timedelta(minutes=(num_candles-5-i)))
-    
-    # Breakout phase
-    breakout_price = box_center + (box_half_range * 1.5)  # Break above box
-    prices.append(breakout_price)
-    volumes.append(15000)  # High volume on breakout
-    timestamps.append(current_time)
+    box_prices = box_center + rng.uniform(-box_half_range, box_half_range, 10)
+    box_volumes = rng.uniform(5000, 7000, 10)
+    
+    # Breakout phase: break above box on high volume
+    breakout_price = box_center + (box_half_range * 1.5)
+    
+    prices = np.concatenate((pre_prices, box_prices, [breakout_price]))
+    volumes = np.concatenate((pre_volumes, box_volumes, [15000.0]))
+    
+    # Minutes before now for each candle
+    minutes_ago = np.concatenate((num_candles - np.arange(5), num_candles - 5 - np.arange(10), [0]))
+    timestamps = [current_time - timedelta(minutes=int(m)) for m in minutes_ago]
     
     return prices, volumes, timestamps
 
@@ -47,8 +45,7 @@ def test_box_detection():
     """Test box detection with simulated price data"""
     logger.info("Testing box detection...")
     
-    # Create box analyzer
-    box_analyzer = BoxAnalyzer()
+    box_analyzer = BOX
     
     # Generate realistic box pattern
     base_price = 100.0
@@ -78,7 +75,7 @@ def test_position_sizing():
     """Test position sizing calculations"""
     logger.info("\nTesting position sizing...")
     
-    box_analyzer = BoxAnalyzer()
+    box_analyzer = BOX
     
     # Test case 1: Small risk
     entry_price = 100.0
@@ -118,7 +115,7 @@ def test_take_profits():
     """Test take profit calculations"""
     logger.info("\nTesting take profit calculations...")
     
-    box_analyzer = BoxAnalyzer()
+    box_analyzer = BOX
     
     # Test case 1: Long trade
     entry_price = 100.0
@@ -162,7 +159,7 @@ def test_box_retest():
     """Test box retest validation"""
     logger.info("\nTesting box retest validation...")
     
-    box_analyzer = BoxAnalyzer()
+    box_analyzer = BOX
     
     # Test case 1: Valid retest
     box_top = 100.0
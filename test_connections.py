@@ -1,43 +1,70 @@
 import os
+import asyncio
 from dotenv import load_dotenv
-import requests
+import aiohttp
 
 # Load environment variables
 load_dotenv()
 
-# Test Polygon.io
-polygon_key = os.getenv('POLYGON_API_KEY')
-print(f"Testing Polygon API connection...")
-polygon_url = f"https://api.polygon.io/v2/aggs/ticker/AAPL/range/1/day/2023-01-01/2023-01-10?apiKey={polygon_key}"
-polygon_response = requests.get(polygon_url)
-print(f"Polygon status: {polygon_response.status_code}")
-print(f"Response: {polygon_response.json()[:100] if polygon_response.ok else 'Failed'}\n")
-
-# Test Alpaca
-alpaca_key = os.getenv('ALPACA_API_KEY')
-alpaca_secret = os.getenv('ALPACA_API_SECRET')
-print(f"Testing Alpaca API connection...")
-alpaca_url = "https://paper-api.alpaca.markets/v2/account"
-alpaca_headers = {
-    'APCA-API-KEY-ID': alpaca_key,
-    'APCA-API-SECRET-KEY': alpaca_secret
-}
-alpaca_response = requests.get(alpaca_url, headers=alpaca_headers)
-print(f"Alpaca status: {alpaca_response.status_code}")
-print(f"Response: {alpaca_response.json() if alpaca_response.ok else 'Failed'}\n")
-
-# Test NewsAPI
-news_key = os.getenv('NEWS_API_KEY')
-print(f"Testing NewsAPI connection...")
-news_url = f"https://newsapi.org/v2/everything?q=AAPL&apiKey={news_key}&pageSize=1"
-news_response = requests.get(news_url)
-print(f"NewsAPI status: {news_response.status_code}")
-print(f"Response: {news_response.json() if news_response.ok else 'Failed'}\n")
-
-# Test Discord Webhook
-discord_url = os.getenv('DISCORD_WEBHOOK_URL')
-print(f"Testing Discord Webhook...")
-discord_data = {"content": "Test message from Options Swing Trade Agent"}
-discord_response = requests.post(discord_url, json=discord_data)
-print(f"Discord Webhook status: {discord_response.status_code}")
-print(f"{'Success' if discord_response.ok else 'Failed'}\n")
+# Shared by every probe in the session
+SESSION_HEADERS = {'User-Agent': 'stock-options-agent/tests', 'Accept-Encoding': 'gzip'}
+PROBE_RETRIES = 2
+PROBE_BACKOFF = 0.2  # seconds, doubled per retry
+
+def _resolver():
+    """aiodns-backed resolver when aiodns is installed, else aiohttp's default"""
+    try:
+        return aiohttp.AsyncResolver()
+    except RuntimeError:
+        return None
+
+async def probe(session, name, method, url, **kwargs):
+    """Issue one request and return its name, status, ok flag and body"""
+    for attempt in range(PROBE_RETRIES + 1):
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                body = await response.json(content_type=None) if response.ok and method == "GET" else None
+                return name, response.status, response.ok, body
+        except aiohttp.ClientError as e:
+            if attempt == PROBE_RETRIES:
+                return name, None, False, e
+            await asyncio.sleep(PROBE_BACKOFF * 2 ** attempt)
+        except Exception as e:
+            return name, None, False, e
+
+async def main():
+    polygon_key = os.getenv('POLYGON_API_KEY')
+    alpaca_headers = {
+        'APCA-API-KEY-ID': os.getenv('ALPACA_API_KEY'),
+        'APCA-API-SECRET-KEY': os.getenv('ALPACA_API_SECRET')
+    }
+    news_key = os.getenv('NEWS_API_KEY')
+    discord_data = {"content": "Test message from Options Swing Trade Agent"}
+
+    print("Testing Polygon, Alpaca, NewsAPI and Discord connections...\n")
+
+    # The probes are independent, so run them concurrently
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=8, ttl_dns_cache=300, resolver=_resolver()),
+                                     headers=SESSION_HEADERS) as session:
+        results = await asyncio.gather(
+            probe(session, "Polygon", "GET",
+                  f"https://api.polygon.io/v2/aggs/ticker/AAPL/range/1/day/2023-01-01/2023-01-10?apiKey={polygon_key}"),
+            probe(session, "Alpaca", "GET", "https://paper-api.alpaca.markets/v2/account",
+                  headers=alpaca_headers),
+            probe(session, "NewsAPI", "GET",
+                  f"https://newsapi.org/v2/everything?q=AAPL&apiKey={news_key}&pageSize=1"),
+            probe(session, "Discord Webhook", "POST", os.getenv('DISCORD_WEBHOOK_URL'),
+                  json=discord_data)
+        )
+
+    for name, status, ok, body in results:
+        print(f"{name} status: {status}")
+        if name == "Discord Webhook":
+            print(f"{'Success' if ok else 'Failed'}\n")
+        elif not ok:
+            print("Response: Failed\n")
+        else:
+            print(f"Response: {str(body)[:100] if name == 'Polygon' else body}\n")
+
+if __name__ == "__main__":
+    asyncio.run(main())
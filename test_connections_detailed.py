@@ -1,43 +1,81 @@
 import os
+import asyncio
 from dotenv import load_dotenv
-import requests
-import json
+import aiohttp
 
 # Load environment variables
 load_dotenv()
 
-# Test Polygon.io with more details
-polygon_key = os.getenv('POLYGON_API_KEY')
-print(f"Testing Polygon API connection...")
-print(f"Key (first 4 chars): {polygon_key[:4]}...")
-polygon_url = f"https://api.polygon.io/v2/reference/news?limit=1&apiKey={polygon_key}"
-try:
-    polygon_response = requests.get(polygon_url)
-    print(f"Polygon status: {polygon_response.status_code}")
-    print(f"Full response: {polygon_response.text[:200]}")
-    if not polygon_response.ok:
-        print("This could indicate an issue with your API key or subscription level.")
-except Exception as e:
-    print(f"Error connecting to Polygon: {e}")
-
-print("\n" + "-"*50 + "\n")
-
-# Test Alpaca with more details
-alpaca_key = os.getenv('ALPACA_API_KEY')
-alpaca_secret = os.getenv('ALPACA_API_SECRET')
-print(f"Testing Alpaca API connection...")
-print(f"Key (first 4 chars): {alpaca_key[:4]}...")
-print(f"Secret (first 4 chars): {alpaca_secret[:4]}...")
-alpaca_url = "https://paper-api.alpaca.markets/v2/account"
-alpaca_headers = {
-    'APCA-API-KEY-ID': alpaca_key,
-    'APCA-API-SECRET-KEY': alpaca_secret
-}
-try:
-    alpaca_response = requests.get(alpaca_url, headers=alpaca_headers)
-    print(f"Alpaca status: {alpaca_response.status_code}")
-    print(f"Full response: {alpaca_response.text[:200]}")
-    if not alpaca_response.ok:
-        print("This suggests your API keys might be incorrect or your account might not be active.")
-except Exception as e:
-    print(f"Error connecting to Alpaca: {e}")
+# Shared by every probe in the session
+SESSION_HEADERS = {'User-Agent': 'stock-options-agent/tests', 'Accept-Encoding': 'gzip'}
+PROBE_RETRIES = 2
+PROBE_BACKOFF = 0.2  # seconds, doubled per retry
+
+def _resolver():
+    """aiodns-backed resolver when aiodns is installed, else aiohttp's default"""
+    try:
+        return aiohttp.AsyncResolver()
+    except RuntimeError:
+        return None
+
+async def probe(session, name, method, url, **kwargs):
+    """Issue one request and return its name, status, ok flag and body (or the error)"""
+    for attempt in range(PROBE_RETRIES + 1):
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                return name, response.status, response.ok, await response.text()
+        except aiohttp.ClientError as e:
+            if attempt == PROBE_RETRIES:
+                return name, None, False, e
+            await asyncio.sleep(PROBE_BACKOFF * 2 ** attempt)
+        except Exception as e:
+            return name, None, False, e
+
+async def main():
+    polygon_key = os.getenv('POLYGON_API_KEY')
+    alpaca_key = os.getenv('ALPACA_API_KEY')
+    alpaca_secret = os.getenv('ALPACA_API_SECRET')
+
+    print(f"Testing Polygon API connection...")
+    print(f"Key (first 4 chars): {polygon_key[:4]}...")
+    print(f"Testing Alpaca API connection...")
+    print(f"Key (first 4 chars): {alpaca_key[:4]}...")
+    print(f"Secret (first 4 chars): {alpaca_secret[:4]}...")
+    alpaca_headers = {
+        'APCA-API-KEY-ID': alpaca_key,
+        'APCA-API-SECRET-KEY': alpaca_secret
+    }
+
+    # The probes are independent, so run them concurrently
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=8, ttl_dns_cache=300, resolver=_resolver()),
+                                     headers=SESSION_HEADERS) as session:
+        (_, polygon_status, polygon_ok, polygon_body), (_, alpaca_status, alpaca_ok, alpaca_body) = \
+            await asyncio.gather(
+                probe(session, "Polygon", "GET",
+                      f"https://api.polygon.io/v2/reference/news?limit=1&apiKey={polygon_key}"),
+                probe(session, "Alpaca", "GET", "https://paper-api.alpaca.markets/v2/account",
+                      headers=alpaca_headers)
+            )
+
+    print("\n" + "-"*50 + "\n")
+
+    if isinstance(polygon_body, Exception):
+        print(f"Error connecting to Polygon: {polygon_body}")
+    else:
+        print(f"Polygon status: {polygon_status}")
+        print(f"Full response: {polygon_body[:200]}")
+        if not polygon_ok:
+            print("This could indicate an issue with your API key or subscription level.")
+
+    print("\n" + "-"*50 + "\n")
+
+    if isinstance(alpaca_body, Exception):
+        print(f"Error connecting to Alpaca: {alpaca_body}")
+    else:
+        print(f"Alpaca status: {alpaca_status}")
+        print(f"Full response: {alpaca_body[:200]}")
+        if not alpaca_ok:
+            print("This suggests your API keys might be incorrect or your account might not be active.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
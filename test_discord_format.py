@@ -1,6 +1,21 @@
-import json
 from alerts.discord_webhook import DiscordWebhook
 
+# Message skeleton, built once; fields are looked up from the signals dict
+SIGNAL_TEMPLATE = (
+    "**Trading Signals for SPY**\n\n"
+    "**Entry Points:**\n"
+    "• Long: {entry_points[long]}\n"
+    "• Short: {entry_points[short]}\n\n"
+    "**Exit Points:**\n"
+    "• Long: {exit_points[long]}\n"
+    "• Short: {exit_points[short]}\n\n"
+    "**Analysis:**\n{analysis}\n\n"
+    "**Confidence:** {confidence}\n\n"
+    "**Key Levels:**\n"
+    "• Support: {key_levels[support]}\n"
+    "• Resistance: {key_levels[resistance]}"
+)
+
 def test_discord_format():
     # Sample trading signals
     signals = {
@@ -21,20 +36,7 @@ def test_discord_format():
     }
     
     # Format the message
-    message = (
-        f"**Trading Signals for SPY**\n\n"
-        f"**Entry Points:**\n"
-        f"• Long: {signals['entry_points']['long']}\n"
-        f"• Short: {signals['entry_points']['short']}\n\n"
-        f"**Exit Points:**\n"
-        f"• Long: {signals['exit_points']['long']}\n"
-        f"• Short: {signals['exit_points']['short']}\n\n"
-        f"**Analysis:**\n{signals['analysis']}\n\n"
-        f"**Confidence:** {signals['confidence']}\n\n"
-        f"**Key Levels:**\n"
-        f"• Support: {signals['key_levels']['support']}\n"
-        f"• Resistance: {signals['key_levels']['resistance']}"
-    )
+    message = SIGNAL_TEMPLATE.format_map(signals)
     
     print("Discord Message Format:")
     print("=" * 50)
@@ -0,0 +1,29 @@
+from utils.helpers import chunk_embeds, format_option_symbol, parse_option_symbol, parse_option_symbols
+
+def test_format_option_symbol():
+    """Valid dates format in both padded and unpadded form; invalid dates give None"""
+    assert format_option_symbol('AAPL', '2023-09-15', 180, 'call') == 'AAPL230915C00180000'
+    assert format_option_symbol('AAPL', '2023-9-15', 180, 'call') == 'AAPL230915C00180000'
+    assert format_option_symbol('SPY', '2025-01-17', 512.5, 'put') == 'SPY250117P00512500'
+    for bad_date in ('2023-13-15', '2023-09-1x', '2023-02-30', '20230915'):
+        assert format_option_symbol('AAPL', bad_date, 180, 'put') is None, bad_date
+
+def test_parse_option_symbols():
+    """The batch parser agrees with the scalar one, including None for invalid symbols"""
+    symbols = ['AAPL230915C00180000', 'SPY250117P00512500', 'bad', 'AAPL230915X00180000']
+    assert parse_option_symbols(symbols) == [parse_option_symbol(s) for s in symbols]
+    assert parse_option_symbols([]) == []
+
+def test_chunk_embeds():
+    """Chunks respect both Discord's embed count and total embed text limits"""
+    small = {"title": "Alert", "description": "x" * 95}
+    large = {"title": "Alert", "fields": [{"name": "Analysis", "value": "x" * 2492}]}
+    assert [len(chunk) for chunk in chunk_embeds([small] * 25, 10, 6000)] == [10, 10, 5]
+    assert [len(chunk) for chunk in chunk_embeds([large, large, large, small], 10, 6000)] == [2, 2]
+    assert list(chunk_embeds([], 10, 6000)) == []
+
+if __name__ == "__main__":
+    test_format_option_symbol()
+    test_parse_option_symbols()
+    test_chunk_embeds()
+    print("Helper tests passed")
@@ -5,6 +5,7 @@ from trading_agent import TradingAgent
 from alerts.discord_webhook import DiscordWebhook
 from config.config import TAKE_PROFIT_LEVELS, STOP_LOSS_LEVELS
 from events.event_queue import EventQueue, Event, EventPriority
+from utils.helpers import install_uvloop
 import json
 
 # Set up logging
@@ -25,6 +26,9 @@ def test_premium_thresholds(agent: TradingAgent):
         ("SPY", 50.0),   # Low price
     ]
     
+    # Same expiration for every case
+    expiration = agent._get_next_friday()
+    
     for symbol, price in test_cases:
         # Test both call and put options
         for option_type in ['call', 'put']:
@@ -32,7 +36,7 @@ def test_premium_thresholds(agent: TradingAgent):
                 symbol,
                 price,
                 option_type,
-                agent._get_next_friday()
+                expiration
             )
             print(f"Symbol: {symbol}, Price: ${price:.2f}, Type: {option_type.upper()}")
             print(f"Calculated Premium: ${premium:.2f}")
@@ -62,18 +66,17 @@ async def test_event_driven_system():
     # Start the agent
     await agent.start()
     
-    # Create test events
-    current_time = datetime.now()
+    # Create test events; all share one timestamp string
+    timestamp = datetime.now().isoformat()
     test_events = [
         Event(
             event_type="price_update",
             data={
             "symbol": "SPY",
                 "price": 500.0,
-                "timestamp": current_time.isoformat()
+                "timestamp": timestamp
             },
             priority=EventPriority.HIGH,
-            timestamp=current_time,
             source="test_price_monitor"
         ),
         Event(
@@ -85,10 +88,9 @@ async def test_event_driven_system():
                     "sentiment_label": "positive",
                     "article_count": 5
                 },
-                "timestamp": current_time.isoformat()
+                "timestamp": timestamp
             },
             priority=EventPriority.MEDIUM,
-            timestamp=current_time,
             source="test_news_monitor"
         )
     ]
@@ -108,4 +110,5 @@ async def test_event_driven_system():
 
 if __name__ == "__main__":
     # Run the async test
+    install_uvloop()
     asyncio.run(test_event_driven_system()) 
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from config.logging_config import setup_logging
 from data.alpaca_connector import AlpacaConnector
@@ -10,38 +11,37 @@ from config.config import TRADING_SYMBOLS
 # Setup logging
 logger = setup_logging()
 
+# Per-host cap on concurrent webhook posts
+DISCORD_CONCURRENCY = 64
+
+# Sentiment score explanation
+SCORE_EXPLANATION = (
+    "**Sentiment Score Range:**\n"
+    "• -1.0 to -0.5: Strongly Negative\n"
+    "• -0.5 to -0.1: Moderately Negative\n"
+    "• -0.1 to 0.1: Neutral\n"
+    "• 0.1 to 0.5: Moderately Positive\n"
+    "• 0.5 to 1.0: Strongly Positive\n\n"
+)
+
 def format_sentiment_data(sentiment_data: dict) -> str:
     """Format sentiment data for Discord message"""
-    # Get only the keywords that have matches
-    matched_keywords = {k: v for k, v in sentiment_data['keyword_matches'].items() if v > 0}
+    # Only the keywords that have matches
+    matched = [(k, v) for k, v in sentiment_data['keyword_matches'].items() if v > 0]
+    keyword_lines = (
+        f"• Total Keyword Matches: {sum(v for _, v in matched)}\n"
+        f"• Matched Keywords:\n"
+        f"{chr(10).join(f'  - {k}: {v}' for k, v in matched)}"
+    ) if matched else ""
     
-    # Sentiment score explanation
-    score_explanation = (
-        "**Sentiment Score Range:**\n"
-        "• -1.0 to -0.5: Strongly Negative\n"
-        "• -0.5 to -0.1: Moderately Negative\n"
-        "• -0.1 to 0.1: Neutral\n"
-        "• 0.1 to 0.5: Moderately Positive\n"
-        "• 0.5 to 1.0: Strongly Positive\n\n"
-    )
-    
-    # Format the sentiment results
-    sentiment_results = (
+    return (
+        f"{SCORE_EXPLANATION}"
         f"**Sentiment Analysis Results:**\n"
         f"• Overall Score: {sentiment_data['overall_score']:.2f}\n"
         f"• Sentiment Label: {sentiment_data['sentiment_label']}\n"
         f"• Articles Analyzed: {sentiment_data['article_count']}\n"
+        f"{keyword_lines}"
     )
-    
-    # Add keyword matches if any exist
-    if matched_keywords:
-        sentiment_results += (
-            f"• Total Keyword Matches: {sum(matched_keywords.values())}\n"
-            f"• Matched Keywords:\n"
-            + "\n".join(f"  - {k}: {v}" for k, v in matched_keywords.items())
-        )
-    
-    return score_explanation + sentiment_results
 
 def format_technical_data(technical_data: dict) -> str:
     """Format technical data for Discord message"""
@@ -56,24 +56,31 @@ def format_technical_data(technical_data: dict) -> str:
     if not has_real_data:
         return "**Technical Analysis:**\n• Real-time market data not available at this time."
     
-    message = "**Technical Analysis Results:**\n"
+    parts = ["**Technical Analysis Results:**\n"]
     for timeframe, data in technical_data.items():
-        message += f"\n**{timeframe} Timeframe:**\n"
+        parts.append(f"\n**{timeframe} Timeframe:**\n")
         if 'rsi' in data:
-            message += f"• RSI: {data['rsi']}\n"
+            parts.append(f"• RSI: {data['rsi']}\n")
         if 'macd' in data:
-            message += f"• MACD: {data['macd']}\n"
+            parts.append(f"• MACD: {data['macd']}\n")
         if 'bollinger_bands' in data:
             bb = data['bollinger_bands']
-            message += f"• Bollinger Bands:\n"
-            message += f"  - Upper: {bb.get('upper', 'N/A')}\n"
-            message += f"  - Middle: {bb.get('middle', 'N/A')}\n"
-            message += f"  - Lower: {bb.get('lower', 'N/A')}\n"
-    return message
+            parts.append(
+                f"• Bollinger Bands:\n"
+                f"  - Upper: {bb.get('upper', 'N/A')}\n"
+                f"  - Middle: {bb.get('middle', 'N/A')}\n"
+                f"  - Lower: {bb.get('lower', 'N/A')}\n"
+            )
+    return "".join(parts)
 
-def run_single_scan():
+def format_signal(signal: dict) -> str:
+    """Format a trade signal for Discord from the summary and details TradeFormatter adds"""
+    return f"{signal['summary']}\n\n{signal['details']}"
+
+async def run_single_scan():
     """Run a single scan for testing purposes"""
     logger.info("Starting test scan...")
+    discord = DiscordWebhook()
     
     try:
         # Initialize components
@@ -81,54 +88,60 @@ def run_single_scan():
         sentiment_analyzer = FinBERTAnalyzer()
         technical_analyzer = TechnicalAnalysis()
         signal_engine = SignalEngine()
-        discord = DiscordWebhook()
         
-        # Send test alert
-        discord.send_notification(
-            message=(
-                f"**Starting Test Scan**\n\n"
-                f"**Symbols to Analyze:**\n"
-                + "\n".join(f"• {symbol}" for symbol in TRADING_SYMBOLS)
-            ),
-            title="Test Scan Started"
-        )
+        # Webhook posts overlap; bound how many are in flight at once
+        semaphore = asyncio.Semaphore(DISCORD_CONCURRENCY)
+        
+        async def notify(message: str, title: str, embeds: list = None):
+            async with semaphore:
+                await discord.send_notification_async(message=message, title=title, embeds=embeds)
         
-        # Process each symbol
-        for symbol in TRADING_SYMBOLS:
+        async def scan_symbol(symbol: str):
             logger.info(f"Processing {symbol}...")
             
-            # Get sentiment data
-            sentiment_data = sentiment_analyzer.get_ticker_sentiment(symbol)
+            # Get sentiment data and technical signals off the event loop
+            sentiment_data, technical_data = await asyncio.gather(
+                asyncio.to_thread(sentiment_analyzer.get_ticker_sentiment, symbol),
+                asyncio.to_thread(technical_analyzer.get_technical_signals, symbol)
+            )
             logger.info(f"Sentiment data: {sentiment_data}")
-            
-            # Get technical signals
-            technical_data = technical_analyzer.get_technical_signals(symbol)
             logger.info(f"Technical data summary: {technical_data.keys() if technical_data else 'None'}")
             
-            # Send analysis results to Discord
-            discord.send_notification(
+            # Generate trade signals
+            signals = signal_engine.generate_signals(symbol, sentiment_data, technical_data)
+            logger.info(f"Generated {len(signals)} signals")
+            
+            # Send analysis results with one embed per valid signal in a single message
+            await notify(
                 message=(
                     f"**Analysis Results for {symbol}**\n\n"
                     f"{format_sentiment_data(sentiment_data)}\n\n"
                     f"{format_technical_data(technical_data)}"
                 ),
-                title=f"Analysis: {symbol}"
+                title=f"Analysis: {symbol}",
+                embeds=[
+                    {"title": f"Trade Signal: {symbol}", "description": format_signal(signal), "color": 0x00ff00}
+                    for signal in signals
+                ]
             )
-            
-            # Generate trade signals
-            signals = signal_engine.generate_signals(symbol, sentiment_data, technical_data)
-            logger.info(f"Generated {len(signals)} signals")
-            
-            # Send alerts for valid signals
-            for signal in signals:
-                discord.send_notification(
-                    message=str(signal),
-                    title=f"Trade Signal: {symbol}"
-                )
-                logger.info(f"Sent alert for {symbol}")
+            if signals:
+                logger.info(f"Sent {len(signals)} alerts for {symbol}")
+        
+        # Send test alert
+        await notify(
+            message=(
+                f"**Starting Test Scan**\n\n"
+                f"**Symbols to Analyze:**\n"
+                + "\n".join(f"• {symbol}" for symbol in TRADING_SYMBOLS)
+            ),
+            title="Test Scan Started"
+        )
+        
+        # Process all symbols concurrently
+        await asyncio.gather(*(scan_symbol(symbol) for symbol in TRADING_SYMBOLS))
         
         # Send completion notification
-        discord.send_notification(
+        await notify(
             message="The test scan has completed successfully.",
             title="Test Scan Completed"
         )
@@ -139,11 +152,12 @@ def run_single_scan():
         logger.error(f"Error during test scan: {e}", exc_info=True)
         
         # Send error notification
-        discord = DiscordWebhook()
-        discord.send_notification(
+        await discord.send_notification_async(
             message=f"An error occurred during the test scan: {str(e)}",
             title="Test Scan Error"
         )
+    finally:
+        await discord.aclose()
 
 if __name__ == "__main__":
-    run_single_scan()
+    asyncio.run(run_single_scan())
@@ -10,9 +10,24 @@ from analysis.technical.technical_analyzer import TechnicalAnalyzer
 from analysis.sentiment.finbert_analyzer import FinbertAnalyzer
 from analysis.ai.openai_explainer import OpenAIExplainer
 from utils.discord_webhook import DiscordWebhook
+from utils.helpers import install_uvloop
 import asyncio
 
+# Message templates for the per-tick logs, built once at import
+_PRICE_MESSAGE = "Symbol: %s, Price: $%.2f, Volume: %s"
+_BOX_MESSAGE = (
+    "Box Analysis - Symbol: %s\n"
+    "Box Detected: %s\n"
+    "Box Top: $%.2f\n"
+    "Box Bottom: $%.2f\n"
+    "Breakout Direction: %s\n"
+    "Volume Confirmation: %s"
+)
+
 class TradingAgent:
+    # Seconds a market clock answer from Alpaca is reused
+    MARKET_OPEN_TTL = 60.0
+    
     def __init__(self, event_queue: EventQueue):
         # Setup logging
         self.loggers = {
@@ -33,6 +48,9 @@ class TradingAgent:
         # Track active trades
         self.active_trades = {}
         
+        # (monotonic time fetched, is open) for _is_market_open
+        self._market_open_cache = (float('-inf'), False)
+        
         # Subscribe to events
         self._subscribe_to_events()
         
@@ -52,7 +70,7 @@ class TradingAgent:
             self.logger.info("Trading agent started successfully")
             
         except Exception as e:
-            self.logger.error(f"Error starting trading agent: {str(e)}")
+            self.logger.error("Error starting trading agent: %s", e)
             raise
 
     async def stop(self):
@@ -63,11 +81,12 @@ class TradingAgent:
                 'type': 'shutdown',
                 'message': 'Options Trading Agent Stopped'
             })
+            self.discord_webhook.close()
             
-            logger.info("Trading agent stopped successfully")
+            self.logger.info("Trading agent stopped successfully")
             
         except Exception as e:
-            self.logger.error(f"Error stopping trading agent: {str(e)}")
+            self.logger.error("Error stopping trading agent: %s", e)
             raise
 
     def _subscribe_to_events(self):
@@ -92,7 +111,7 @@ class TradingAgent:
                 })
                 
         except Exception as e:
-            self.logger.error(f"Error handling status event: {str(e)}")
+            self.logger.error("Error handling status event: %s", e)
 
     async def _start_market_monitoring(self):
         """Start monitoring market events"""
@@ -108,12 +127,12 @@ class TradingAgent:
             price = event.data.get('price')
             volume = event.data.get('volume')
             
-            if not all([symbol, price, volume]):
+            if not symbol or not price or volume is None:
                 return
                 
-            # Log price action
-            price_message = f"Symbol: {symbol}, Price: ${price:.2f}, Volume: {volume:,}"
-            self.loggers['price_action'].info(price_message)
+            # Log price action; the message is formatted once and shared with Discord
+            price_message = _PRICE_MESSAGE % (symbol, price, format(volume, ','))
+            self.loggers['price_action'].info("%s", price_message)
             self.discord_webhook.stream_logs('price_action', price_message)
                 
             # Get historical data for analysis
@@ -123,22 +142,22 @@ class TradingAgent:
             analysis = self.technical_analyzer.analyze(symbol, historical_data)
             
             # Log box analysis
-            box_message = (
-                f"Box Analysis - Symbol: {symbol}\n"
-                f"Box Detected: {analysis.get('box_detected', False)}\n"
-                f"Box Top: ${analysis.get('box_top', 0.00):.2f}\n"
-                f"Box Bottom: ${analysis.get('box_bottom', 0.00):.2f}\n"
-                f"Breakout Direction: {analysis.get('breakout_direction', 'None')}\n"
-                f"Volume Confirmation: {analysis.get('volume_confirmation', False)}"
+            box_message = _BOX_MESSAGE % (
+                symbol,
+                analysis.get('box_detected', False),
+                analysis.get('box_top', 0.00),
+                analysis.get('box_bottom', 0.00),
+                analysis.get('breakout_direction', 'None'),
+                analysis.get('volume_confirmation', False)
             )
-            self.loggers['box_method'].info(box_message)
+            self.loggers['box_method'].info("%s", box_message)
             self.discord_webhook.stream_logs('box_method', box_message)
             
             if analysis.get('box_detected'):
                 await self._process_box_breakout(symbol, analysis)
                 
         except Exception as e:
-            self.loggers['errors'].error(f"Error handling price update: {str(e)}")
+            self.loggers['errors'].error("Error handling price update: %s", e)
 
     def _process_box_breakout(self, symbol: str, analysis: Dict[str, Any]):
         """Process a box breakout signal"""
@@ -164,13 +183,20 @@ class TradingAgent:
             
             # Log trade signal
             self.loggers['trades'].info(
-                f"New Trade Signal - Symbol: {symbol}\n" +
-                f"Type: {'CALL' if analysis['is_breakout_up'] else 'PUT'}\n" +
-                f"Entry: ${analysis['breakout_price']:.2f}\n" +
-                f"Stop Loss: ${analysis['stop_loss']:.2f}\n" +
-                f"Box Range: ${analysis['box_top']:.2f} - ${analysis['box_bottom']:.2f}\n" +
-                f"Sentiment Score: {sentiment:.2f}\n" +
-                f"Explanation: {explanation}"
+                "New Trade Signal - Symbol: %s\n"
+                "Type: %s\n"
+                "Entry: $%.2f\n"
+                "Stop Loss: $%.2f\n"
+                "Box Range: $%.2f - $%.2f\n"
+                "Sentiment Score: %.2f\n"
+                "Explanation: %s",
+                symbol,
+                'CALL' if analysis['is_breakout_up'] else 'PUT',
+                analysis['breakout_price'],
+                analysis['stop_loss'],
+                analysis['box_top'], analysis['box_bottom'],
+                sentiment,
+                explanation
             )
             
             # Create trade signal
@@ -198,7 +224,7 @@ class TradingAgent:
             }
             
         except Exception as e:
-            self.loggers['errors'].error(f"Error processing box breakout: {str(e)}")
+            self.loggers['errors'].error("Error processing box breakout: %s", e)
 
     async def _handle_news_update(self, event: Event):
         """Handle news update events"""
@@ -206,7 +232,7 @@ class TradingAgent:
             symbol = event.data.get('symbol')
             news = event.data.get('news')
             
-            if not all([symbol, news]):
+            if not symbol or not news:
                 return
                 
             # Analyze sentiment
@@ -223,7 +249,7 @@ class TradingAgent:
             ))
                 
         except Exception as e:
-            self.logger.error(f"Error handling news update: {str(e)}")
+            self.logger.error("Error handling news update: %s", e)
 
     def _handle_sentiment_update(self, event: Event):
         """Handle sentiment update events"""
@@ -231,7 +257,7 @@ class TradingAgent:
             symbol = event.data.get('symbol')
             sentiment = event.data.get('sentiment')
             
-            if not all([symbol, sentiment]):
+            if not symbol or sentiment is None:
                 return
                 
             # Check if we have an active trade
@@ -252,38 +278,42 @@ class TradingAgent:
                     })
             
         except Exception as e:
-            self.logger.error(f"Error handling sentiment update: {str(e)}")
+            self.logger.error("Error handling sentiment update: %s", e)
 
     def _is_market_open(self) -> bool:
-        """Check if market is open"""
-        return self.alpaca.is_market_open()
+        """Check if market is open, reusing Alpaca's answer for MARKET_OPEN_TTL seconds"""
+        now = time.monotonic()
+        fetched_at, is_open = self._market_open_cache
+        if now - fetched_at < self.MARKET_OPEN_TTL:
+            return is_open
+        is_open = self.alpaca.is_market_open()
+        self._market_open_cache = (now, is_open)
+        return is_open
 
     async def _check_market_events(self):
         """Check for market events"""
-        for symbol in TRADING_SYMBOLS:
+        # One batched quote request for all symbols
+        quotes = self.alpaca.get_latest_quotes(TRADING_SYMBOLS)
+        
+        for symbol, price_data in quotes.items():
             try:
-                # Get latest price and volume
-                price_data = self.alpaca.get_latest_quote(symbol)
+                # Create price update event
+                price_event = Event(
+                    event_type="price_update",
+                    priority=EventPriority.HIGH,
+                    data={
+                        'symbol': symbol,
+                        'price': price_data['ask_price'],
+                        'volume': price_data['ask_size']
+                    },
+                    source="market_monitor"
+                )
                 
-                if price_data:
-                    # Create price update event
-                    price_event = Event(
-                        event_type="price_update",
-                        priority=EventPriority.HIGH,
-                        data={
-                            'symbol': symbol,
-                            'price': price_data['ask_price'],
-                            'volume': price_data['ask_size']
-                        },
-                        timestamp=datetime.now(),
-                        source="market_monitor"
-                    )
-                    
-                    # Publish price update
-                    await self.event_queue.publish(price_event)
+                # Publish price update
+                await self.event_queue.publish(price_event)
                     
             except Exception as e:
-                self.logger.error(f"Error checking market events for {symbol}: {str(e)}")
+                self.logger.error("Error checking market events for %s: %s", symbol, e)
                 
         # Wait a bit before next check
         await asyncio.sleep(1)  # Check every second
@@ -303,5 +333,6 @@ if __name__ == "__main__":
     if not openai_api_key:
         raise ValueError("OPENAI_API_KEY environment variable is required")
     
-    agent = TradingAgent()
-    agent.start() 
\ No newline at end of file
+    install_uvloop()
+    agent = TradingAgent(EventQueue())
+    asyncio.run(agent.start()) 
\ No newline at end of file
@@ -1,5 +1,8 @@
+import asyncio
+import atexit
 import boto3
 import logging
+import threading
 import time
 
 logger = logging.getLogger(__name__)
@@ -7,22 +10,34 @@ logger = logging.getLogger(__name__)
 class AWSIntegration:
     """Handles AWS service integrations for the trading agent"""
     
+    # The buffer is sent once it holds this many metrics or the oldest one
+    # has waited this many seconds (checked on each put and by a timer thread)
+    METRIC_FLUSH_SIZE = 20
+    METRIC_FLUSH_INTERVAL = 20.0
+    
     def __init__(self, region_name='us-east-2'):
         """Initialize AWS clients - no credentials needed since we're using IAM role"""
+        # Metrics queued by put_metric/buffer_metric until the next flush().
+        # Callers may be on different threads, so the buffer and its start
+        # time are only touched under _buffer_lock; sends happen outside it
+        self._metric_buffer = []
+        self._buffer_started = None
+        self._buffer_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = None
         try:
             # The SDK automatically uses the EC2 instance role credentials
             self.cloudwatch = boto3.client('cloudwatch', region_name=region_name)
             self.logs = boto3.client('logs', region_name=region_name)
             logger.info("AWS integration initialized successfully")
+            # Verified on the first flush so construction never waits on the network
+            self.permissions_ok = None
             
-            # Test permissions by putting a test metric
-            try:
-                self.cloudwatch.list_metrics(Namespace='AWS/EC2', MetricName='CPUUtilization', Dimensions=[])
-                self.permissions_ok = True
-                logger.info("AWS CloudWatch permissions verified")
-            except Exception as perm_e:
-                logger.warning(f"CloudWatch permissions not active yet: {perm_e}")
-                self.permissions_ok = False
+            # Sends a stale buffer when no put arrives to do it; close() sends
+            # whatever is left at shutdown
+            self._flusher = threading.Thread(target=self._flush_stale_loop, name="cloudwatch-metrics", daemon=True)
+            self._flusher.start()
+            atexit.register(self.close)
                 
         except Exception as e:
             logger.error(f"Error initializing AWS integration: {e}")
@@ -30,33 +45,131 @@ class AWSIntegration:
             self.logs = None
             self.permissions_ok = False
     
+    def close(self):
+        """Stop the timer thread and send any buffered metrics"""
+        self._closed.set()
+        if self._flusher is not None and self._flusher.is_alive():
+            self._flusher.join(timeout=5)
+        return self.flush()
+    
+    def _flush_stale_loop(self):
+        """Send the buffer once its oldest metric is METRIC_FLUSH_INTERVAL seconds old"""
+        timeout = self.METRIC_FLUSH_INTERVAL
+        while not self._closed.wait(timeout):
+            if self.permissions_ok is False:
+                return
+            with self._buffer_lock:
+                if self._buffer_started is None:
+                    timeout = self.METRIC_FLUSH_INTERVAL
+                    continue
+                age = time.monotonic() - self._buffer_started
+                if age < self.METRIC_FLUSH_INTERVAL:
+                    timeout = self.METRIC_FLUSH_INTERVAL - age
+                    continue
+                batch = self._take_locked()
+            timeout = self.METRIC_FLUSH_INTERVAL
+            self._send_batch(batch)
+    
+    def _verify_permissions(self):
+        """Probe CloudWatch once; the result gates every later send"""
+        try:
+            self.cloudwatch.list_metrics(Namespace='AWS/EC2', MetricName='CPUUtilization', Dimensions=[])
+            self.permissions_ok = True
+            logger.info("AWS CloudWatch permissions verified")
+        except Exception as perm_e:
+            logger.warning(f"CloudWatch permissions not active yet: {perm_e}")
+            self.permissions_ok = False
+        return self.permissions_ok
+    
+    @staticmethod
+    def _metric_datum(metric_name, value, ticker, unit):
+        """Build a single CloudWatch MetricDatum"""
+        return {
+            'MetricName': metric_name,
+            'Dimensions': [
+                {
+                    'Name': 'Ticker',
+                    'Value': ticker
+                },
+            ],
+            'Value': value,
+            'Unit': unit
+        }
+    
     def put_metric(self, metric_name, value, ticker="ALL", unit="Count"):
-        """Send a custom metric to CloudWatch"""
-        if not self.cloudwatch or not self.permissions_ok:
+        """Queue a custom metric for CloudWatch, sending the batch when it is full or stale"""
+        if not self.cloudwatch or self.permissions_ok is False:
             # Skip without error logging since we know permissions aren't ready
             return False
             
+        batch = self._buffer_and_take_if_due(self._metric_datum(metric_name, value, ticker, unit))
+        if batch is None:
+            return True
+        return self._send_batch(batch)
+    
+    async def put_metric_async(self, metric_name, value, ticker="ALL", unit="Count"):
+        """put_metric for async callers
+        
+        Buffering stays on the event loop (it is a locked list append); only a
+        due batch's blocking put_metric_data calls go to a worker thread.
+        """
+        if not self.cloudwatch or self.permissions_ok is False:
+            return False
+        
+        batch = self._buffer_and_take_if_due(self._metric_datum(metric_name, value, ticker, unit))
+        if batch is None:
+            return True
+        return await asyncio.to_thread(self._send_batch, batch)
+    
+    def buffer_metric(self, metric_name, value, ticker="ALL", unit="Count"):
+        """Queue a metric to be sent with the next flush()"""
+        datum = self._metric_datum(metric_name, value, ticker, unit)
+        with self._buffer_lock:
+            self._append_locked(datum)
+    
+    def _append_locked(self, datum):
+        if not self._metric_buffer:
+            self._buffer_started = time.monotonic()
+        self._metric_buffer.append(datum)
+    
+    def _take_locked(self):
+        batch, self._metric_buffer = self._metric_buffer, []
+        self._buffer_started = None
+        return batch
+    
+    def _buffer_and_take_if_due(self, datum):
+        """Queue a datum; return the whole buffer for sending once it is full or stale, else None"""
+        with self._buffer_lock:
+            self._append_locked(datum)
+            if (len(self._metric_buffer) < self.METRIC_FLUSH_SIZE
+                    and time.monotonic() - self._buffer_started < self.METRIC_FLUSH_INTERVAL):
+                return None
+            return self._take_locked()
+    
+    def flush(self):
+        """Send all buffered metrics in as few put_metric_data calls as possible"""
+        with self._buffer_lock:
+            batch = self._take_locked()
+        return self._send_batch(batch)
+    
+    def _send_batch(self, batch):
+        """put_metric_data a batch taken from the buffer"""
+        if not batch or not self.cloudwatch or self.permissions_ok is False:
+            return False
+        if self.permissions_ok is None and not self._verify_permissions():
+            return False
+            
         try:
-            response = self.cloudwatch.put_metric_data(
-                Namespace='TradingAgent',
-                MetricData=[
-                    {
-                        'MetricName': metric_name,
-                        'Dimensions': [
-                            {
-                                'Name': 'Ticker',
-                                'Value': ticker
-                            },
-                        ],
-                        'Value': value,
-                        'Unit': unit
-                    },
-                ]
-            )
+            # PutMetricData accepts up to 1000 metrics per request
+            for start in range(0, len(batch), 1000):
+                self.cloudwatch.put_metric_data(
+                    Namespace='TradingAgent',
+                    MetricData=batch[start:start + 1000]
+                )
             return True
         except Exception as e:
             # Only log once and then suppress subsequent errors
             if self.permissions_ok:
-                logger.error(f"Error putting metric {metric_name}: {e}")
+                logger.error(f"Error flushing {len(batch)} metrics: {e}")
                 self.permissions_ok = False
             return False
@@ -1,11 +1,114 @@
+import atexit
 import logging
-import json
+import queue
+import threading
+import time
+from functools import partial
 import requests
+import orjson
 import os
 from typing import Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.helpers import chunk_embeds
+
+# (connect, read) seconds for every webhook POST
+REQUEST_TIMEOUT = (3, 5)
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Embed colors
+_COLOR_GREEN = 0x00ff00
+_COLOR_YELLOW = 0xffff00
+_COLOR_ORANGE = 0xff9900
+_COLOR_RED = 0xff0000
+
+# Static parts of the send_update embeds. Each send merges these into a new
+# dict with its dynamic keys; the templates themselves are never mutated.
+_EMBED_SENTIMENT = {
+    "title": "🔄 SENTIMENT UPDATE",
+    "color": _COLOR_GREEN
+}
+_EMBED_STARTUP = {
+    "title": "🤖 PRODUCTION DEPLOYMENT",
+    "color": _COLOR_GREEN,
+    "fields": (
+        {
+            "name": "Symbols to Monitor",
+            "value": "• SPY\n• QQQ\n• IWM",
+            "inline": False
+        },
+        {
+            "name": "Market Hours",
+            "value": "09:30 - 16:00 ET",
+            "inline": True
+        },
+        {
+            "name": "Mode",
+            "value": "Real-time event processing",
+            "inline": True
+        }
+    )
+}
+_EMBED_MARKET_HOURS = {
+    "title": "⏰ MARKET HOURS",
+    "color": _COLOR_YELLOW
+}
+_EMBED_ERROR = {
+    "title": "⚠️ ERROR",
+    "color": _COLOR_ORANGE
+}
+_EMBED_FATAL = {
+    "title": "🚨 FATAL ERROR",
+    "color": _COLOR_RED
+}
+_EMBED_UNKNOWN = {
+    "title": "⚠️ UNKNOWN UPDATE",
+    "color": _COLOR_RED
+}
+
+class _RateLimiter:
+    """Token bucket allowing `rate` posts per `per` seconds to one webhook, shared by all threads"""
+    
+    def __init__(self, rate: int = 5, per: float = 2.0):
+        self.rate = rate
+        self.per = per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a post is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._blocked_until:
+                    self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.per)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) * self.per / self.rate
+                else:
+                    wait = self._blocked_until - now
+            time.sleep(wait)
+    
+    def block_for(self, seconds: float):
+        """Hold every post for `seconds`, e.g. when Discord reports the bucket is empty"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
 
 class DiscordWebhook:
+    # Queued embeds are posted together: up to BATCH_SIZE per message and
+    # MAX_EMBED_CHARS of embed text (Discord's limits), waiting at most
+    # FLUSH_INTERVAL seconds for more to arrive
+    BATCH_SIZE = 10
+    MAX_EMBED_CHARS = 6000
+    FLUSH_INTERVAL = 0.5
+    MAX_RATE_LIMIT_RETRIES = 3
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
@@ -15,6 +118,106 @@ class DiscordWebhook:
             raise ValueError("DISCORD_WEBHOOK_URL environment variable is required")
         if not self.logs_webhook_url:
             raise ValueError("DISCORD_LOGS_WEBHOOK_URL environment variable is required")
+        
+        # One keep-alive session for both webhooks; transient server errors are
+        # retried by the adapter, 429s by _post under the rate limiter
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=10,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[500, 502, 503, 504],
+                allowed_methods=["POST"],
+                raise_on_status=False
+            )
+        ))
+        # Discord allows 5 requests per 2 seconds per webhook, so each URL gets
+        # its own bucket (one shared bucket if both variables name the same URL)
+        self._limiters = {url: _RateLimiter(rate=5, per=2.0)
+                          for url in (self.webhook_url, self.logs_webhook_url)}
+        
+        # send_update embed builders by update type; each takes (update, timestamp)
+        self._update_builders = {
+            'sentiment_update': self._build_sentiment_embed,
+            'startup': partial(self._build_message_embed, _EMBED_STARTUP,
+                               'Options Trading Agent Started in Production Mode'),
+            'market_hours': partial(self._build_message_embed, _EMBED_MARKET_HOURS, 'Market is currently closed'),
+            'error': partial(self._build_message_embed, _EMBED_ERROR, 'An error occurred'),
+            'fatal_error': partial(self._build_message_embed, _EMBED_FATAL, 'A fatal error occurred')
+        }
+        
+        # send_signal/send_update/stream_logs only enqueue (url, embed);
+        # the worker thread does the HTTP
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._flush_loop, name="discord-webhook", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+    
+    def close(self):
+        """Post anything still queued, stop the worker and release the pooled connections"""
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout=10)
+        self.session.close()
+    
+    def _flush_loop(self):
+        """Collect queued embeds into batches and post one message per webhook per batch"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while len(batch) < self.BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            by_url: Dict[str, list] = {}
+            for url, embed in batch:
+                by_url.setdefault(url, []).append(embed)
+            # An oversized message is rejected outright (400, not retried), so
+            # split on total size too rather than lose the whole batch
+            for url, embeds in by_url.items():
+                for chunk in chunk_embeds(embeds, self.BATCH_SIZE, self.MAX_EMBED_CHARS):
+                    self._post(url, chunk)
+            if stopping:
+                return
+    
+    def _post(self, url: str, embeds: list):
+        """POST one message carrying the given embeds, waiting out rate limits"""
+        try:
+            body = orjson.dumps({"embeds": embeds})
+            limiter = self._limiters[url]
+            for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+                limiter.acquire()
+                response = self.session.post(url, data=body, headers=_JSON_HEADERS, timeout=REQUEST_TIMEOUT)
+                if response.headers.get('X-RateLimit-Remaining') == '0':
+                    # Bucket drained: pause before the next post instead of earning a 429
+                    limiter.block_for(float(response.headers.get('X-RateLimit-Reset-After', limiter.per)))
+                if response.status_code != 429 or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                    break
+                retry_after = float(response.headers.get('Retry-After', '1'))
+                self.logger.warning(f"Discord rate limited, retrying in {retry_after:.2f}s")
+                limiter.block_for(retry_after)
+            
+            if response.status_code != 204:
+                self.logger.error(f"Failed to send {len(embeds)} Discord embed(s): {response.text}")
+            else:
+                self.logger.info(f"Successfully sent {len(embeds)} Discord embed(s)")
+        except Exception as e:
+            self.logger.error(f"Error sending {len(embeds)} Discord embed(s): {str(e)}")
             
     def test_connection(self) -> bool:
         """Test the Discord webhook connections"""
@@ -23,21 +226,25 @@ class DiscordWebhook:
             embed = {
                 "title": "Discord Webhook Test",
                 "description": "Testing main webhook connection...",
-                "color": 0x00ff00,
-                "timestamp": datetime.now().isoformat()
+                "color": _COLOR_GREEN,
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
             message = {
                 "embeds": [embed]
             }
             
-            response = requests.post(self.webhook_url, json=message)
+            self._limiters[self.webhook_url].acquire()
+            response = self.session.post(self.webhook_url, data=orjson.dumps(message),
+                                         headers=_JSON_HEADERS, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             self.logger.info("Main Discord webhook test successful")
             
             # Test logs webhook
             embed["description"] = "Testing logs webhook connection..."
-            response = requests.post(self.logs_webhook_url, json=message)
+            self._limiters[self.logs_webhook_url].acquire()
+            response = self.session.post(self.logs_webhook_url, data=orjson.dumps(message),
+                                         headers=_JSON_HEADERS, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             self.logger.info("Logs Discord webhook test successful")
             
@@ -47,7 +254,7 @@ class DiscordWebhook:
             return False
             
     def send_signal(self, signal: Dict[str, Any]):
-        """Send a trading signal to Discord"""
+        """Queue a trading signal for Discord"""
         try:
             # Format take profit levels
             tp_levels = "\n".join([
@@ -58,7 +265,7 @@ class DiscordWebhook:
             # Create embed for the signal
             embed = {
                 "title": f"📈 BOX BREAKOUT SIGNAL - {signal['symbol']}",
-                "color": 0x00ff00,  # Green color
+                "color": _COLOR_GREEN,
                 "fields": [
                     {
                         "name": "Signal Details",
@@ -84,136 +291,82 @@ class DiscordWebhook:
                         "inline": False
                     }
                 ],
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            message = {
-                "embeds": [embed]
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
-            response = requests.post(self.webhook_url, json=message)
-            if response.status_code != 204:
-                self.logger.error(f"Failed to send Discord message: {response.text}")
+            self._queue.put((self.webhook_url, embed))
                 
         except Exception as e:
             self.logger.error(f"Error sending Discord signal: {str(e)}")
             
     def send_update(self, update: Dict[str, Any]):
-        """Send a trade update to Discord"""
+        """Queue a trade update for Discord"""
         try:
             update_type = update.get('type', '')
+            timestamp = datetime.now(timezone.utc).isoformat()
             self.logger.info(f"Sending Discord update of type: {update_type}")
             
-            if update_type == 'sentiment_update':
-                embed = {
-                    "title": "🔄 SENTIMENT UPDATE",
-                    "color": 0x00ff00,  # Green color
-                    "fields": [
-                        {
-                            "name": "Symbol",
-                            "value": update['symbol'],
-                            "inline": True
-                        },
-                        {
-                            "name": "New Sentiment",
-                            "value": f"{update['new_sentiment']:.2f}",
-                            "inline": True
-                        },
-                        {
-                            "name": "Details",
-                            "value": update['explanation'],
-                            "inline": False
-                        }
-                    ],
-                    "timestamp": datetime.now().isoformat()
-                }
-            elif update_type == 'startup':
-                embed = {
-                    "title": "🤖 PRODUCTION DEPLOYMENT",
-                    "description": update.get('message', 'Options Trading Agent Started in Production Mode'),
-                    "color": 0x00ff00,  # Green color
-                    "fields": [
-                        {
-                            "name": "Symbols to Monitor",
-                            "value": "• SPY\n• QQQ\n• IWM",
-                            "inline": False
-                        },
-                        {
-                            "name": "Market Hours",
-                            "value": "09:30 - 16:00 ET",
-                            "inline": True
-                        },
-                        {
-                            "name": "Mode",
-                            "value": "Real-time event processing",
-                            "inline": True
-                        }
-                    ],
-                    "timestamp": datetime.now().isoformat()
-                }
-            elif update_type == 'market_hours':
-                embed = {
-                    "title": "⏰ MARKET HOURS",
-                    "description": update.get('message', 'Market is currently closed'),
-                    "color": 0xffff00,  # Yellow color
-                    "timestamp": datetime.now().isoformat()
-                }
-            elif update_type == 'error':
-                embed = {
-                    "title": "⚠️ ERROR",
-                    "description": update.get('message', 'An error occurred'),
-                    "color": 0xff9900,  # Orange color
-                    "timestamp": datetime.now().isoformat()
-                }
-            elif update_type == 'fatal_error':
-                embed = {
-                    "title": "🚨 FATAL ERROR",
-                    "description": update.get('message', 'A fatal error occurred'),
-                    "color": 0xff0000,  # Red color
-                    "timestamp": datetime.now().isoformat()
-                }
-            else:
-                embed = {
-                    "title": "⚠️ UNKNOWN UPDATE",
-                    "description": f"Unknown update type: {update_type}",
-                    "color": 0xff0000,  # Red color for errors
-                    "timestamp": datetime.now().isoformat()
-                }
-            
-            message = {
-                "embeds": [embed]
-            }
+            builder = self._update_builders.get(update_type, self._build_unknown_embed)
+            embed = builder(update, timestamp)
             
-            self.logger.info(f"Sending Discord message to webhook: {self.webhook_url}")
-            response = requests.post(self.webhook_url, json=message)
-            if response.status_code != 204:
-                self.logger.error(f"Failed to send Discord update: {response.text}")
-            else:
-                self.logger.info("Successfully sent Discord update")
+            self._queue.put((self.webhook_url, embed))
                 
         except Exception as e:
             self.logger.error(f"Error sending Discord update: {str(e)}")
             
+    @staticmethod
+    def _build_sentiment_embed(update: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        return {
+            **_EMBED_SENTIMENT,
+            "fields": [
+                {
+                    "name": "Symbol",
+                    "value": update['symbol'],
+                    "inline": True
+                },
+                {
+                    "name": "New Sentiment",
+                    "value": f"{update['new_sentiment']:.2f}",
+                    "inline": True
+                },
+                {
+                    "name": "Details",
+                    "value": update['explanation'],
+                    "inline": False
+                }
+            ],
+            "timestamp": timestamp
+        }
+    
+    @staticmethod
+    def _build_message_embed(template: Dict[str, Any], default_message: str,
+                             update: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        return {
+            **template,
+            "description": update.get('message', default_message),
+            "timestamp": timestamp
+        }
+    
+    @staticmethod
+    def _build_unknown_embed(update: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        return {
+            **_EMBED_UNKNOWN,
+            "description": f"Unknown update type: {update.get('type', '')}",
+            "timestamp": timestamp
+        }
+            
     def stream_logs(self, log_type: str, message: str):
-        """Stream logs to a separate Discord channel"""
+        """Queue a log line for the separate Discord logs channel"""
         try:
             embed = {
                 "title": f"📊 {log_type.upper()}",
                 "description": message,
-                "color": 0x00ff00,  # Green color
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            message = {
-                "embeds": [embed]
+                "color": _COLOR_GREEN,
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
             self.logger.info(f"Sending {log_type} log to Discord")
-            response = requests.post(self.logs_webhook_url, json=message)
-            if response.status_code != 204:
-                self.logger.error(f"Failed to send {log_type} log to Discord: {response.text}")
-            else:
-                self.logger.info(f"Successfully sent {log_type} log to Discord")
+            self._queue.put((self.logs_webhook_url, embed))
                 
         except Exception as e:
             self.logger.error(f"Error sending {log_type} log to Discord: {str(e)}") 
\ No newline at end of file
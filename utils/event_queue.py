@@ -1,5 +1,6 @@
 import logging
-from typing import Dict, Any, Callable, List
+import threading
+from typing import Dict, Any, Callable, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
@@ -23,21 +24,28 @@ class Event:
 class EventQueue:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.subscribers: Dict[str, List[Callable]] = {}
+        # Copy-on-write: writers replace a type's tuple under the lock, so
+        # publish can iterate whatever tuple it reads without locking
+        self.subscribers: Dict[str, Tuple[Callable, ...]] = {}
+        self._lock = threading.Lock()
         self.running = True
         
     def subscribe(self, event_type: str, callback: Callable):
         """Subscribe to an event type"""
-        if event_type not in self.subscribers:
-            self.subscribers[event_type] = []
-        self.subscribers[event_type].append(callback)
-        self.logger.debug(f"Subscribed to {event_type}")
+        with self._lock:
+            self.subscribers[event_type] = self.subscribers.get(event_type, ()) + (callback,)
+        self.logger.debug("Subscribed to %s", event_type)
         
     def unsubscribe(self, event_type: str, callback: Callable):
         """Unsubscribe from an event type"""
-        if event_type in self.subscribers:
-            self.subscribers[event_type].remove(callback)
-            self.logger.debug(f"Unsubscribed from {event_type}")
+        with self._lock:
+            callbacks = self.subscribers.get(event_type)
+            if callbacks is None:
+                return
+            remaining = list(callbacks)
+            remaining.remove(callback)
+            self.subscribers[event_type] = tuple(remaining)
+        self.logger.debug("Unsubscribed from %s", event_type)
             
     def publish(self, event: Event):
         """Publish an event to subscribers"""
@@ -45,12 +53,11 @@ class EventQueue:
             return
             
         event_type = event.event_type
-        if event_type in self.subscribers:
-            for callback in self.subscribers[event_type]:
-                try:
-                    callback(event)
-                except Exception as e:
-                    self.logger.error(f"Error in event handler for {event_type}: {str(e)}")
+        for callback in self.subscribers.get(event_type, ()):
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.error("Error in event handler for %s: %s", event_type, e)
                     
     def stop(self):
         """Stop the event queue"""
@@ -1,46 +1,98 @@
 import logging
+import re
+import time
+import numpy as np
+import pandas as pd
 import pytz
-from datetime import datetime
+from datetime import date, datetime
 
 from config.config import MARKET_HOURS
 
 logger = logging.getLogger(__name__)
 
+# OCC option symbol: ticker, YYMMDD expiration, C/P, strike in thousandths
+_OCC_RE = re.compile(r'^([A-Z]{1,6})(\d{6})([CP])(\d{8})$')
+
+# Market timezone and session bounds never change, so resolve them once
+_EASTERN = pytz.timezone('America/New_York')
+_MARKET_OPEN = datetime.strptime(MARKET_HOURS['open'], '%H:%M').time()
+_MARKET_CLOSE = datetime.strptime(MARKET_HOURS['close'], '%H:%M').time()
+
+class TTLCache:
+    """Small size-bounded cache whose entries expire after ttl seconds"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = {}
+    
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+    
+    def set(self, key, value):
+        self._data.pop(key, None)
+        if len(self._data) >= self.maxsize:
+            # Dicts keep insertion order, so the first key is the oldest
+            del self._data[next(iter(self._data))]
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+def install_uvloop():
+    """Use uvloop for asyncio if it is installed (it is not available on Windows)"""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    uvloop.install()
+    return True
+
 def is_market_open():
     """Check if the market is currently open"""
     try:
-        eastern = pytz.timezone('America/New_York')
-        now = datetime.now(eastern)
+        now = datetime.now(_EASTERN)
         
         # Check if it's a weekday
         if now.weekday() >= 5:  # 5 is Saturday, 6 is Sunday
             return False
-            
-        # Convert market hours to current day
-        market_open = datetime.strptime(MARKET_HOURS['open'], '%H:%M').time()
-        market_close = datetime.strptime(MARKET_HOURS['close'], '%H:%M').time()
         
         # Check if current time is within market hours
-        current_time = now.time()
-        return market_open <= current_time <= market_close
+        return _MARKET_OPEN <= now.time() <= _MARKET_CLOSE
     
     except Exception as e:
         logger.error(f"Error checking if market is open: {e}")
         # Default to assuming market is open on error
         return True
 
+def _occ_date(expiration_date):
+    """YYMMDD for a valid zero-padded YYYY-MM-DD date, else None"""
+    if len(expiration_date) != 10 or expiration_date[4] != '-' or expiration_date[7] != '-':
+        return None
+    try:
+        date.fromisoformat(expiration_date)  # rejects e.g. month 13 or "09-1x"
+    except ValueError:
+        return None
+    return f"{expiration_date[2:4]}{expiration_date[5:7]}{expiration_date[8:10]}"
+
 def format_option_symbol(ticker, expiration_date, strike, option_type):
     """Format an option symbol in standard OCC format"""
     try:
-        # Parse date (assuming format is YYYY-MM-DD)
-        exp_date = datetime.strptime(expiration_date, '%Y-%m-%d')
+        # A valid zero-padded YYYY-MM-DD maps straight onto the OCC YYMMDD
+        # digits; anything else (e.g. "2023-9-15") goes through strptime, which
+        # raises for invalid dates
+        exp_str = _occ_date(expiration_date) or datetime.strptime(expiration_date, '%Y-%m-%d').strftime('%y%m%d')
         
-        # Format according to OCC standard (e.g. AAPL230915C00180000)
-        exp_str = exp_date.strftime('%y%m%d')
-        strike_str = str(int(float(strike) * 1000)).zfill(8)  # Convert to cents and pad with zeros
+        # Strike in thousandths of a dollar, rounded so 180.005 doesn't truncate
+        strike_thousandths = round(float(strike) * 1000)
         opt_type = 'C' if option_type.lower() == 'call' else 'P'
         
-        return f"{ticker}{exp_str}{opt_type}{strike_str}"
+        # Format according to OCC standard (e.g. AAPL230915C00180000)
+        return f"{ticker}{exp_str}{opt_type}{strike_thousandths:08d}"
     
     except Exception as e:
         logger.error(f"Error formatting option symbol: {e}")
@@ -49,27 +101,17 @@ def format_option_symbol(ticker, expiration_date, strike, option_type):
 def parse_option_symbol(option_symbol):
     """Parse an OCC option symbol to its components"""
     try:
-        # Find where the date part begins (first digit after ticker)
-        for i, char in enumerate(option_symbol):
-            if char.isdigit():
-                ticker_end = i
-                break
-        else:
+        match = _OCC_RE.match(option_symbol)
+        if not match:
             return None
-        
-        ticker = option_symbol[:ticker_end]
-        date_part = option_symbol[ticker_end:ticker_end+6]
-        opt_type = option_symbol[ticker_end+6]
-        strike_part = option_symbol[ticker_end+7:]
+        ticker, date_part, opt_type, strike_part = match.groups()
         
         # Parse date (YY MM DD)
-        year = int('20' + date_part[:2])
-        month = int(date_part[2:4])
-        day = int(date_part[4:6])
-        expiration_date = f"{year}-{month:02d}-{day:02d}"
+        year = 2000 + int(date_part[:2])
+        expiration_date = f"{year}-{date_part[2:4]}-{date_part[4:6]}"
         
-        # Parse strike (convert from cents to dollars)
-        strike = float(strike_part) / 1000
+        # Parse strike (convert from thousandths to dollars)
+        strike = int(strike_part) / 1000
         
         # Get option type
         option_type = 'call' if opt_type == 'C' else 'put'
@@ -84,3 +126,54 @@ def parse_option_symbol(option_symbol):
     except Exception as e:
         logger.error(f"Error parsing option symbol {option_symbol}: {e}")
         return None
+
+def parse_option_symbols(option_symbols):
+    """Parse a batch of OCC option symbols in one vectorized pass
+    
+    Returns one entry per input, in order: the same dict parse_option_symbol
+    builds, or None for symbols that are not valid OCC symbols.
+    """
+    try:
+        parts = pd.Series(option_symbols, dtype=object).str.extract(_OCC_RE)
+        valid = parts[0].notna()
+        if not valid.any():
+            return [None] * len(parts)
+        
+        matched = parts[valid]
+        dates = matched[1]
+        records = iter(pd.DataFrame({
+            'ticker': matched[0],
+            'expiration_date': '20' + dates.str[:2] + '-' + dates.str[2:4] + '-' + dates.str[4:6],
+            'strike': matched[3].astype('int64') / 1000,
+            'option_type': np.where(matched[2] == 'C', 'call', 'put')
+        }).to_dict('records'))
+        return [next(records) if is_valid else None for is_valid in valid]
+    
+    except Exception as e:
+        logger.error(f"Error parsing {len(option_symbols)} option symbols: {e}")
+        return [None] * len(option_symbols)
+
+def embed_length(embed):
+    """Characters of an embed that count toward Discord's 6000-per-message limit"""
+    fields = embed.get('fields') or ()
+    return (len(embed.get('title') or '') + len(embed.get('description') or '')
+            + len((embed.get('footer') or {}).get('text') or '')
+            + len((embed.get('author') or {}).get('name') or '')
+            + sum(len(field.get('name') or '') + len(field.get('value') or '') for field in fields))
+
+def chunk_embeds(embeds, max_count, max_chars):
+    """Split embeds, in order, into lists that each fit in one Discord message
+    
+    A new list starts when the next embed would exceed max_count embeds or
+    max_chars characters; an embed that is too long on its own is sent alone.
+    """
+    chunk, chunk_chars = [], 0
+    for embed in embeds:
+        chars = embed_length(embed)
+        if chunk and (len(chunk) == max_count or chunk_chars + chars > max_chars):
+            yield chunk
+            chunk, chunk_chars = [], 0
+        chunk.append(embed)
+        chunk_chars += chars
+    if chunk:
+        yield chunk
@@ -1,10 +1,45 @@
+import atexit
+import gzip
 import logging
 import os
+import queue
+import shutil
+import threading
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import colorlog
 
+class GzRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler whose rolled-over backups are gzipped (name.log.1.gz, ...)"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.namer = self._gz_name
+        self.rotator = self._gz_rotate
+    
+    @staticmethod
+    def _gz_name(default_name):
+        return default_name + '.gz'
+    
+    @staticmethod
+    def _gz_rotate(source, dest):
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+# Loggers configured by the first setup_logging() call
+_LOGGERS = None
+_LOGGERS_LOCK = threading.Lock()
+
 def setup_logging():
+    """Configure logging once; later calls return the same component loggers"""
+    global _LOGGERS
+    with _LOGGERS_LOCK:
+        if _LOGGERS is None:
+            _LOGGERS = _configure_logging()
+        return _LOGGERS
+
+def _configure_logging():
     """Configure logging with separate files for different components"""
     # Create logs directory if it doesn't exist
     if not os.path.exists('logs'):
@@ -43,7 +78,7 @@ def setup_logging():
     price_logger.addHandler(price_console_handler)
     
     # File handler
-    price_handler = RotatingFileHandler(
+    price_handler = GzRotatingFileHandler(
         f'{today_log_dir}/price_action.log',
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
@@ -51,7 +86,8 @@ def setup_logging():
     price_handler.setFormatter(logging.Formatter(
         '%(asctime)s - %(levelname)s - %(message)s'
     ))
-    price_logger.addHandler(price_handler)
+    # Written by the queue listener; only this logger's records
+    price_handler.addFilter(logging.Filter('price_action'))
     
     # Box Method Logger
     box_logger = logging.getLogger('box_method')
@@ -64,7 +100,7 @@ def setup_logging():
     box_logger.addHandler(box_console_handler)
     
     # File handler
-    box_handler = RotatingFileHandler(
+    box_handler = GzRotatingFileHandler(
         f'{today_log_dir}/box_method.log',
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
@@ -72,7 +108,8 @@ def setup_logging():
     box_handler.setFormatter(logging.Formatter(
         '%(asctime)s - %(levelname)s - %(message)s'
     ))
-    box_logger.addHandler(box_handler)
+    # Written by the queue listener; only this logger's records
+    box_handler.addFilter(logging.Filter('box_method'))
     
     # Trade Logger
     trade_logger = logging.getLogger('trades')
@@ -85,7 +122,7 @@ def setup_logging():
     trade_logger.addHandler(trade_console_handler)
     
     # File handler
-    trade_handler = RotatingFileHandler(
+    trade_handler = GzRotatingFileHandler(
         f'{today_log_dir}/trades.log',
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
@@ -93,7 +130,8 @@ def setup_logging():
     trade_handler.setFormatter(logging.Formatter(
         '%(asctime)s - %(levelname)s - %(message)s'
     ))
-    trade_logger.addHandler(trade_handler)
+    # Written by the queue listener; only this logger's records
+    trade_handler.addFilter(logging.Filter('trades'))
     
     # Error Logger
     error_logger = logging.getLogger('errors')
@@ -106,7 +144,7 @@ def setup_logging():
     error_logger.addHandler(error_console_handler)
     
     # File handler
-    error_handler = RotatingFileHandler(
+    error_handler = GzRotatingFileHandler(
         f'{today_log_dir}/errors.log',
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
@@ -114,7 +152,18 @@ def setup_logging():
     error_handler.setFormatter(logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     ))
-    error_logger.addHandler(error_handler)
+    # Written by the queue listener; only this logger's records
+    error_handler.addFilter(logging.Filter('errors'))
+    
+    # File writes happen on the listener's background thread: the loggers
+    # only enqueue records, and each file handler's filter picks its own
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    for logger in (price_logger, box_logger, trade_logger, error_logger):
+        logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, price_handler, box_handler, trade_handler, error_handler)
+    listener.start()
+    atexit.register(listener.stop)
     
     return {
         'price_action': price_logger,